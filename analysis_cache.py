@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from process_memory import frame_bytes
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Analysis:
+    """A parsed dataset with its figures, their JSON and its table view"""
+
+    def __init__(self, key, frame, fig1, fig2, graph1_json, graph2_json, table, total_rows):
+        self.key = key
+        self.frame = frame
+        self.fig1 = fig1
+        self.fig2 = fig2
+        self.graph1_json = graph1_json
+        self.graph2_json = graph2_json
+        self.table = table
+        self.total_rows = total_rows
+        # Figures hold the same data as their JSON, so count the JSON twice for them
+        self.nbytes = frame_bytes(frame) + 2 * (len(graph1_json or '') + len(graph2_json or ''))
+
+
+class AnalysisCache:
+    """LRU cache of analyses keyed by file content hash, bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.file_keys = {}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, entry):
+        with self.lock:
+            previous = self.entries.pop(entry.key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self.entries[entry.key] = entry
+            self.nbytes += entry.nbytes
+            # Evict least recently used entries, but always keep the newest one
+            while self.nbytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return entry
+
+    def key_for_file(self, path):
+        """Content key for a file on disk, rehashed only when its size or mtime changes"""
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self.file_keys.get(path)
+        if cached is None or cached[0] != signature:
+            extension = path.rsplit('.', 1)[-1].lower()
+            cached = (signature, f'{extension}:{file_digest(path)}')
+            self.file_keys[path] = cached
+        return cached[1]
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.nbytes, 'maxBytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
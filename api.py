@@ -1,45 +1,94 @@
-from flask import Flask, jsonify, request
+import hmac
+import os
+import threading
+
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import pandas as pd
 
+from data_store import shared_store
+from json_provider import dumps, install, response_format
+from metrics import RequestMetrics, gauges
+from player_filter import search_arguments
+from process_memory import memory_usage
+from profiler import DEFAULT_INTERVAL, profile_for
+from response_cache import ResponseCache
+import tasks
+from worker_pool import Overloaded, RequestTimeout, WorkerPool
+
 app = Flask(__name__)
+# Serialize responses with orjson, including NumPy arrays and NaN as null
+install(app)
 # Enable CORS for all routes and origins
-CORS(app, resources={r"/*": {"origins": "*"}})
+CORS(app, resources={r"/*": {"origins": "*"}}, expose_headers=["X-Total-Count", "ETag"])
+
+# Response cache bounds
+app.config['RESPONSE_CACHE_SIZE'] = 512
+app.config['RESPONSE_CACHE_TTL'] = 300
+
+# Seconds between checks of the data files for changes; 0 disables the watcher
+app.config['DATA_WATCH_INTERVAL'] = float(os.environ.get('DATA_WATCH_INTERVAL', 0))
+# Read the CSVs through their memory-mapped binary caches
+app.config['DATA_CACHE'] = os.environ.get('DATA_CACHE', '1') != '0'
+# Token required by the admin endpoints; they are disabled while it is unset
+app.config['ADMIN_TOKEN'] = os.environ.get('API_ADMIN_TOKEN')
+# Largest list accepted by the batch endpoints
+app.config['BATCH_MAX_ITEMS'] = 100
+# Processes for team stats and criteria search; 0 runs them in the request thread
+app.config['WORKER_PROCESSES'] = int(os.environ.get('WORKER_PROCESSES', 0))
+# Offloaded requests allowed in flight before new ones get 503; 0 means 4 per worker
+app.config['WORKER_QUEUE'] = int(os.environ.get('WORKER_QUEUE', 0))
+# Seconds an offloaded request may run before it gets 504
+app.config['REQUEST_TIMEOUT'] = float(os.environ.get('REQUEST_TIMEOUT', 30))
+# Log one JSON line of phase timings per request to the nba.requests logger
+app.config['REQUEST_LOG'] = os.environ.get('REQUEST_LOG', '0') != '0'
+# Longest sampling window accepted by the profile endpoint
+app.config['PROFILE_MAX_SECONDS'] = 60
 
+response_cache = ResponseCache(app.config['RESPONSE_CACHE_SIZE'], app.config['RESPONSE_CACHE_TTL'])
 # Load all data when the server starts
-try:
-    # Load player data
-    players_df = pd.read_csv('nba.csv')
-    players_df['Player'] = players_df['Player'].astype(str)
-    players_df['Pos'] = players_df['Pos'].astype(str)
-    players_df['Tm'] = players_df['Tm'].astype(str)
-
-    # Load team data
-    teams_df = pd.read_csv('nbaallelo.csv')
-    teams_df['date_game'] = pd.to_datetime(teams_df['date_game'])
-    teams_df = teams_df[teams_df['lg_id'] == 'NBA']  # Filter for NBA games only
-
-    # Load franchise data
-    franchise_df = pd.read_csv('frenchise.CSV')
-
-except Exception as e:
-    print(f"Error loading data: {str(e)}")
-    players_df = None
-    teams_df = None
-    franchise_df = None
+store = shared_store(cache=app.config['DATA_CACHE'])
+
+# Anything cached from a previous snapshot is stale once a new one goes live
+store.on_swap(lambda dataset: response_cache.clear())
+
+pool = WorkerPool(app.config['WORKER_PROCESSES'], app.config['WORKER_QUEUE'], app.config['REQUEST_TIMEOUT'])
+# Workers hold the snapshot they were forked with, so a new one gets fresh workers
+store.on_swap(lambda dataset: pool.recycle())
+
+# Phase timings, request counters and cache/pool gauges at /metrics
+metrics = RequestMetrics(app, log_requests=app.config['REQUEST_LOG'])
+metrics.add_collector(lambda: gauges('response_cache', response_cache.stats(), 'Response cache statistic'))
+metrics.add_collector(lambda: gauges('worker_pool', pool.stats(), 'Worker pool statistic'))
+
+@app.errorhandler(Overloaded)
+def handle_overloaded(e):
+    response = jsonify({'error': str(e)})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+@app.errorhandler(RequestTimeout)
+def handle_request_timeout(e):
+    return jsonify({'error': str(e)}), 504
+
+def get_data_version():
+    return store.current.version
 
 @app.route('/api/players', methods=['GET'])
+@response_cache.cached(get_data_version)
 def get_players():
     try:
-        search_term = request.args.get('search', '').lower()
+        search_term = request.args.get('search', '')
+        rank = request.args.get('rank', 'false').lower() == 'true'
+        try:
+            limit = max(int(request.args['limit']), 0)
+        except (KeyError, ValueError, TypeError):
+            limit = None
         
-        if players_df is not None:
-            if search_term:
-                filtered_players = players_df[players_df['Player'].str.lower().str.contains(search_term, na=False)]
-            else:
-                filtered_players = players_df
-                
-            players_list = filtered_players['Player'].tolist()
+        data = store.current
+        if data.name_search is not None:
+            players_list = data.name_search.search(search_term, limit=limit, rank=rank)
             return jsonify(players_list)
         return jsonify([])
     except Exception as e:
@@ -47,11 +96,13 @@ def get_players():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/teams', methods=['GET'])
+@response_cache.cached(get_data_version)
 def get_teams():
     try:
-        if teams_df is not None:
+        data = store.current
+        if data.teams_df is not None:
             # Get unique teams from the franchise data
-            teams_list = franchise_df['Team'].unique().tolist()
+            teams_list = data.franchise_df['Team'].unique().tolist()
             return jsonify(teams_list)
         return jsonify([])
     except Exception as e:
@@ -59,50 +110,36 @@ def get_teams():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/team/<team_id>', methods=['GET'])
+@response_cache.cached(get_data_version)
 def get_team_stats(team_id):
     try:
-        if teams_df is None or franchise_df is None:
-            print(f"Error: Data not loaded - teams_df: {teams_df is not None}, franchise_df: {franchise_df is not None}")
+        data = store.current
+        team_index = data.team_index
+        if team_index is None:
+            print(f"Error: Data not loaded - teams_df: {data.teams_df is not None}, franchise_df: {data.franchise_df is not None}")
             return jsonify({'error': 'Data not loaded properly'}), 500
 
         # Get team info from franchise data
-        team_info = franchise_df[franchise_df['Team'] == team_id]
+        team_info = team_index.info.get(team_id)
         
-        if team_info.empty:
-            print(f"Error: Team {team_id} not found in franchise data")
+        if team_info is None:
             return jsonify({'error': f'Team {team_id} not found'}), 404
-            
-        team_info = team_info.iloc[0]
-        
-        # Get recent team games
-        team_games = teams_df[teams_df['team_id'] == team_id].sort_values('date_game', ascending=False)
         
-        if team_games.empty:
-            print(f"Error: No games found for team {team_id}")
+        if team_id not in team_index:
             return jsonify({'error': f'No games found for team {team_id}'}), 404
         
-        recent_games = team_games.head(10)  # Last 10 games
-        
         # Calculate team statistics
+        recent_games, season_stats = pool.run(tasks.team_summary, data.version, team_id)
         team_stats = {
             'name': team_id,
-            'info': {
-                'fullName': team_info['Full_Name'],
-                'league': team_info['League'],
-                'conference': team_info['Conference'],
-                'division': team_info['Division']
-            },
-            'recentGames': recent_games[['date_game', 'game_result', 'pts', 'opp_pts', 'elo_n']].to_dict('records'),
-            'seasonStats': {
-                'wins': len(team_games[team_games['game_result'] == 'W']),
-                'losses': len(team_games[team_games['game_result'] == 'L']),
-                'avgPoints': float(team_games['pts'].mean()),
-                'avgPointsAllowed': float(team_games['opp_pts'].mean()),
-                'currentElo': float(team_games.iloc[0]['elo_n']) if not team_games.empty else None
-            }
+            'info': team_info,
+            'recentGames': recent_games,  # Last 10 games
+            'seasonStats': season_stats
         }
         return jsonify(team_stats)
     
+    except (Overloaded, RequestTimeout):
+        raise
     except Exception as e:
         print(f"Error in get_team_stats for team {team_id}: {str(e)}")
         import traceback
@@ -110,125 +147,381 @@ def get_team_stats(team_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/player/<name>', methods=['GET'])
+@response_cache.cached(get_data_version)
 def get_player_stats(name):
     try:
-        if players_df is not None:
-            player_data = players_df[players_df['Player'] == name]
+        player_index = store.current.player_index
+        if player_index is not None:
+            # Exact match by default; ?match=normalized ignores case and accents
+            normalized = request.args.get('match', 'exact') == 'normalized'
+            player_name = player_index.resolve(name, normalized=normalized)
             
-            if not player_data.empty:
-                # Add debug logging
-                print(f"Player position for {name}: {player_data['Pos'].values[0]}")
-                
-                player_stats = {
-                    'name': name,
-                    'position': player_data['Pos'].values[0],
-                    'team': player_data['Tm'].values[0],
-                    'basicStats': {
-                        'pointsPerGame': float(player_data['PTS'].values[0]),
-                        'reboundsPerGame': float(player_data['TRB'].values[0]),
-                        'assistsPerGame': float(player_data['AST'].values[0]),
-                        'fieldGoalPercentage': float(player_data['FG%'].values[0] * 100),
-                        'threePointPercentage': float(player_data['3P%'].values[0] * 100),
-                        'freeThrowPercentage': float(player_data['FT%'].values[0] * 100)
-                    },
-                    'detailedStats': {
-                        'gamesPlayed': int(player_data['G'].values[0]),
-                        'minutesPerGame': float(player_data['MP'].values[0]),
-                        'fieldGoalsPerGame': float(player_data['FG'].values[0]),
-                        'fieldGoalAttempts': float(player_data['FGA'].values[0]),
-                        'threePointersPerGame': float(player_data['3P'].values[0]),
-                        'threePointAttempts': float(player_data['3PA'].values[0]),
-                        'freeThrowsPerGame': float(player_data['FT'].values[0]),
-                        'freeThrowAttempts': float(player_data['FTA'].values[0]),
-                        'offensiveRebounds': float(player_data['ORB'].values[0]),
-                        'defensiveRebounds': float(player_data['DRB'].values[0]),
-                        'stealsPerGame': float(player_data['STL'].values[0]),
-                        'blocksPerGame': float(player_data['BLK'].values[0]),
-                        'turnovers': float(player_data['TOV'].values[0]),
-                        'personalFouls': float(player_data['PF'].values[0])
-                    },
-                    'radarStats': {
-                        'scoring': min(float(player_data['PTS'].values[0]) / 30, 1),
-                        'rebounding': min(float(player_data['TRB'].values[0]) / 15, 1),
-                        'playmaking': min(float(player_data['AST'].values[0]) / 10, 1),
-                        'efficiency': float(player_data['FG%'].values[0]),
-                        'defense': min((float(player_data['STL'].values[0]) + float(player_data['BLK'].values[0])) / 5, 1)
-                    }
-                }
-                return jsonify(player_stats)
+            if player_name is not None:
+                return Response(player_index.payload(player_name), mimetype='application/json')
         
         return jsonify({'error': 'Player not found'}), 404
     except Exception as e:
         print(f"Error in get_player_stats: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/players/search', methods=['GET'])
-def search_players_by_criteria():
+@app.route('/api/player/<name>/similar', methods=['GET'])
+@response_cache.cached(get_data_version)
+def get_similar_players(name):
     try:
-        if players_df is None:
-            return jsonify([])
+        data = store.current
+        # pool=seasons searches every season in all_seasons.csv instead of the current roster
+        pool_name = request.args.get('pool', 'players')
+        if pool_name not in ('players', 'seasons'):
+            return jsonify({'error': f'Unknown pool: {pool_name}'}), 400
+        index = data.similarity if pool_name == 'players' else data.season_similarity
+        if index is None:
+            return jsonify({'error': f'No {pool_name} data loaded'}), 404
 
-        # Get search criteria from query parameters and convert to float, defaulting to 0
         try:
-            min_points = float(request.args.get('min_points', 0))
+            k = min(max(int(request.args.get('k', 10)), 1), 100)
         except (ValueError, TypeError):
-            min_points = 0
-            
+            return jsonify({'error': 'k must be an integer'}), 400
+        metric = request.args.get('metric', 'cosine')
+        include_same = request.args.get('include_same', 'false').lower() == 'true'
+
+        row = index.row_for(name, request.args.get('season') or None)
+        if row is None:
+            return jsonify({'error': 'Player not found'}), 404
+
         try:
-            min_rebounds = float(request.args.get('min_rebounds', 0))
-        except (ValueError, TypeError):
-            min_rebounds = 0
-            
+            found = index.neighbors(row, k=k, metric=metric, exclude_same_label=not include_same)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        score = 'similarity' if metric == 'cosine' else 'distance'
+        neighbors = [dict(index.describe(neighbor), **{score: round(value, 4)}) for neighbor, value in found]
+        return jsonify({'player': index.describe(row), 'metric': metric, 'pool': pool_name, 'neighbors': neighbors})
+    except Exception as e:
+        print(f"Error in get_similar_players: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+def batch_items(field):
+    """Return (list of strings under `field` in the JSON body, None) or (None, error response)"""
+    body = request.get_json(silent=True)
+    items = body.get(field) if isinstance(body, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+        return None, (jsonify({'error': f'Request body must be a JSON object with a "{field}" list of strings'}), 400)
+    if len(items) > app.config['BATCH_MAX_ITEMS']:
+        return None, (jsonify({'error': f'At most {app.config["BATCH_MAX_ITEMS"]} {field} per request'}), 400)
+    return items, None
+
+@app.route('/api/players/batch', methods=['POST'])
+def get_players_batch():
+    try:
+        names, error = batch_items('names')
+        if error is not None:
+            return error
+
+        player_index = store.current.player_index
+        if player_index is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+
+        # Exact match by default; "match": "normalized" ignores case and accents
+        normalized = request.get_json().get('match', 'exact') == 'normalized'
+        # Player payloads are already serialized, so the response is assembled from bytes
+        results = []
+        errors = 0
+        for name in names:
+            player_name = player_index.resolve(name, normalized=normalized)
+            try:
+                if player_name is None:
+                    raise KeyError('Player not found')
+                results.append(b'{"query":' + dumps(name) + b',"player":' + player_index.payload(player_name) + b'}')
+            except (KeyError, ValueError) as e:
+                results.append(dumps({'query': name, 'error': e.args[0]}))
+                errors += 1
+
+        body = b'{"results":[' + b','.join(results) + b'],"errors":' + str(errors).encode() + b'}'
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        print(f"Error in get_players_batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/teams/batch', methods=['POST'])
+def get_teams_batch():
+    try:
+        team_ids, error = batch_items('teams')
+        if error is not None:
+            return error
+
+        data = store.current
+        team_index = data.team_index
+        if team_index is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+
+        found = list(dict.fromkeys(team_id for team_id in team_ids
+                                   if team_id in team_index.info and team_id in team_index))
+        summaries = pool.run(tasks.team_summaries, data.version, found)
+
+        results = []
+        for team_id in team_ids:
+            if team_id not in team_index.info:
+                results.append({'query': team_id, 'error': f'Team {team_id} not found'})
+            elif team_id not in summaries:
+                results.append({'query': team_id, 'error': f'No games found for team {team_id}'})
+            else:
+                recent_games, season_stats = summaries[team_id]
+                results.append({'query': team_id, 'team': {
+                    'name': team_id,
+                    'info': team_index.info[team_id],
+                    'recentGames': recent_games,
+                    'seasonStats': season_stats
+                }})
+        return jsonify({'results': results, 'errors': sum('error' in result for result in results)})
+    except (Overloaded, RequestTimeout):
+        raise
+    except Exception as e:
+        print(f"Error in get_teams_batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/team/<team_id>/trades', methods=['GET'])
+@response_cache.cached(get_data_version)
+def search_team_trades(team_id):
+    try:
+        data = store.current
+        if data.trade_engine is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+        if team_id not in data.trade_engine:
+            return jsonify({'error': f'Team {team_id} not found'}), 404
+
         try:
-            min_assists = float(request.args.get('min_assists', 0))
+            options = {
+                'give': int(request.args.get('give', 3)),
+                'get': int(request.args.get('get', 2)),
+                'objective': request.args.get('objective', 'efficiency'),
+                'partner': request.args.get('partner') or None,
+                'limit': min(max(int(request.args.get('limit', 10)), 1), 100),
+                'max_candidates': min(max(int(request.args.get('candidates', 10)), 1), 15)
+            }
+            for name in ('max_partner_loss', 'max_minutes_change'):
+                if request.args.get(name):
+                    options[name] = float(request.args[name])
         except (ValueError, TypeError):
-            min_assists = 0
-            
-        position = request.args.get('position', '').upper()
-        team = request.args.get('team', '').upper()
-
-        # Debug logging
-        print(f"Search criteria - Position: {position}, Points: {min_points}, Rebounds: {min_rebounds}, Assists: {min_assists}, Team: {team}")
-
-        # Start with all players
-        filtered_df = players_df.copy()
-
-        # Apply filters based on criteria only if they are greater than 0
-        if min_points > 0:
-            filtered_df = filtered_df[filtered_df['PTS'] >= min_points]
-        if min_rebounds > 0:
-            filtered_df = filtered_df[filtered_df['TRB'] >= min_rebounds]
-        if min_assists > 0:
-            filtered_df = filtered_df[filtered_df['AST'] >= min_assists]
-        if position:
-            # Handle position search more flexibly
-            position_mask = filtered_df['Pos'].str.contains(position, case=False, na=False)
-            filtered_df = filtered_df[position_mask]
-            print(f"Players found for position {position}: {len(filtered_df)}")
-        if team:
-            filtered_df = filtered_df[filtered_df['Tm'] == team]
-
-        # Sort by points in descending order
-        filtered_df = filtered_df.sort_values('PTS', ascending=False)
-
-        # Get the filtered players with their stats
-        players_list = filtered_df.apply(lambda row: {
-            'name': row['Player'],
-            'position': row['Pos'],
-            'team': row['Tm'],
-            'points': float(row['PTS']),
-            'rebounds': float(row['TRB']),
-            'assists': float(row['AST']),
-            'gamesPlayed': int(row['G']),
-            'minutesPerGame': float(row['MP']),
-            'fieldGoalPercentage': float(row['FG%'] * 100),
-            'threePointPercentage': float(row['3P%'] * 100)
-        }, axis=1).tolist()
-
-        return jsonify(players_list)
+            return jsonify({'error': 'give, get, limit and candidates must be integers and limits numbers'}), 400
+
+        try:
+            result = pool.run(tasks.search_trades, data.version, team_id, options)
+        except KeyError as e:
+            return jsonify({'error': e.args[0]}), 404
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        result['team'] = team_id
+        result['objective'] = options['objective']
+        return jsonify(result)
+    except (Overloaded, RequestTimeout):
+        raise
+    except Exception as e:
+        print(f"Error in search_team_trades for team {team_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/trades/evaluate', methods=['POST'])
+def evaluate_trades():
+    try:
+        body = request.get_json(silent=True)
+        trades = body.get('trades') if isinstance(body, dict) else None
+        if not isinstance(trades, list) or not all(isinstance(trade, dict) for trade in trades):
+            return jsonify({'error': 'Request body must be a JSON object with a "trades" list of objects'}), 400
+        if len(trades) > app.config['BATCH_MAX_ITEMS']:
+            return jsonify({'error': f'At most {app.config["BATCH_MAX_ITEMS"]} trades per request'}), 400
+
+        trade_engine = store.current.trade_engine
+        if trade_engine is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+
+        results = []
+        for trade in trades:
+            try:
+                impact = trade_engine.evaluate(trade.get('team'), list(trade.get('sends') or []),
+                                               trade.get('partner'), list(trade.get('receives') or []))
+                results.append({'trade': trade, 'impact': impact})
+            except (KeyError, ValueError, TypeError) as e:
+                results.append({'trade': trade, 'error': e.args[0] if e.args else str(e)})
+        return jsonify({'results': results, 'errors': sum('error' in result for result in results)})
+    except Exception as e:
+        print(f"Error in evaluate_trades: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/players/search', methods=['GET'])
+@response_cache.cached(get_data_version)
+def search_players_by_criteria():
+    try:
+        data = store.current
+        if data.player_filter is None:
+            return jsonify([])
+
+        # Criteria, pagination, ordering and projection, shared with app.py
+        try:
+            total, players_list = pool.run(tasks.search_players, data.version, search_arguments(request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        response = jsonify(players_list)
+        response.headers['X-Total-Count'] = str(total)
+        return response
+    except (Overloaded, RequestTimeout):
+        raise
     except Exception as e:
         print(f"Error in search_players_by_criteria: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+def iso_date(ns):
+    return pd.Timestamp(ns).strftime('%Y-%m-%d')
+
+@app.route('/api/team/<team_id>/elo', methods=['GET'])
+@response_cache.cached(get_data_version)
+def get_team_elo(team_id):
+    try:
+        elo = store.current.elo
+        if elo is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+        if team_id not in elo.dates:
+            return jsonify({'error': f'No games found for team {team_id}'}), 404
+
+        try:
+            # An empty value means absent, matching the response cache key that drops it
+            date = request.args.get('date') or None
+            found = elo.rating_on(team_id, date) if date else (elo.dates[team_id][-1], elo.current(team_id))
+        except ValueError:
+            return jsonify({'error': f'Invalid date: {date}'}), 400
+
+        if found is None:
+            return jsonify({'error': f'No games for team {team_id} on or before {date}'}), 404
+        return jsonify({'team': team_id, 'date': date, 'gameDate': iso_date(found[0]), 'elo': found[1]})
+    except Exception as e:
+        print(f"Error in get_team_elo for team {team_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/team/<team_id>/elo/history', methods=['GET'])
+@response_cache.cached(get_data_version)
+def get_team_elo_history(team_id):
+    try:
+        elo = store.current.elo
+        if elo is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+        if team_id not in elo.dates:
+            return jsonify({'error': f'No games found for team {team_id}'}), 404
+
+        try:
+            dates, ratings = elo.trajectory(team_id, request.args.get('start') or None,
+                                            request.args.get('end') or None)
+        except ValueError:
+            return jsonify({'error': 'Invalid start or end date'}), 400
+
+        try:
+            orient = response_format(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        days = dates.astype('datetime64[ns]').astype('datetime64[D]').astype(str).tolist()
+        if orient == 'columns':
+            return jsonify({'date': days, 'elo': ratings})
+        return jsonify([{'date': day, 'elo': rating} for day, rating in zip(days, ratings.tolist())])
+    except Exception as e:
+        print(f"Error in get_team_elo_history for team {team_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/elo/snapshot', methods=['GET'])
+@response_cache.cached(get_data_version)
+def get_elo_snapshot():
+    try:
+        elo = store.current.elo
+        if elo is None:
+            return jsonify({'error': 'Data not loaded properly'}), 500
+
+        date = request.args.get('date') or None
+        try:
+            ratings = elo.snapshot(date if date else pd.Timestamp.max)
+        except ValueError:
+            return jsonify({'error': f'Invalid date: {date}'}), 400
+
+        try:
+            orient = response_format(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if orient == 'columns':
+            team_ids, game_dates, elos = zip(*ratings) if ratings else ((), (), ())
+            return jsonify({'team': list(team_ids),
+                            'lastGame': [iso_date(game_date) for game_date in game_dates],
+                            'elo': list(elos)})
+        return jsonify([{'team': team_id, 'lastGame': iso_date(game_date), 'elo': rating}
+                        for team_id, game_date, rating in ratings])
+    except Exception as e:
+        print(f"Error in get_elo_snapshot: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    stats = response_cache.stats()
+    stats['dataVersion'] = store.current.version
+    stats['workerPool'] = pool.stats()
+    return jsonify(stats)
+
+def admin_authorized():
+    # Without a token the endpoints stay closed: CORS is open and a bare POST needs no preflight,
+    # so any page a user visits could otherwise trigger reloads, even against a loopback server
+    token = app.config['ADMIN_TOKEN']
+    supplied = request.headers.get('X-Admin-Token')
+    return bool(token) and supplied is not None and hmac.compare_digest(supplied.encode(), token.encode())
+
+@app.route('/api/admin/data', methods=['GET'])
+def get_data_status():
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    return jsonify(store.current.describe())
+
+@app.route('/api/admin/memory', methods=['GET'])
+def get_memory_usage():
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    usage = memory_usage()
+    usage['frameBytes'] = store.current.describe()['frameBytes']
+    return jsonify(usage)
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_data():
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    try:
+        force = request.args.get('force', 'false').lower() == 'true'
+        dataset, swapped = store.reload(force=force)
+        status = dataset.describe()
+        status['reloaded'] = swapped
+        return jsonify(status)
+    except Exception as e:
+        # The previous snapshot stays active
+        print(f"Error in reload_data: {str(e)}")
+        return jsonify({"error": str(e), "version": store.current.version}), 500
+
+# One profile at a time, so profiling cannot tie up more than one request thread
+profile_lock = threading.Lock()
+
+@app.route('/api/admin/profile', methods=['POST'])
+def profile_requests():
+    if not admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    try:
+        seconds = min(float(request.args.get('seconds', 5)), app.config['PROFILE_MAX_SECONDS'])
+        interval = max(float(request.args.get('interval', DEFAULT_INTERVAL)), 0.001)
+    except ValueError:
+        return jsonify({'error': 'seconds and interval must be numbers'}), 400
+    if seconds <= 0:
+        return jsonify({'error': 'seconds must be positive'}), 400
+    if not profile_lock.acquire(blocking=False):
+        return jsonify({'error': 'A profile is already running'}), 409
+    try:
+        # Samples the other server threads while this one waits; collapsed stacks for flamegraph tools
+        return Response(profile_for(seconds, interval), mimetype='text/plain')
+    finally:
+        profile_lock.release()
+
 if __name__ == '__main__':
+    if app.config['DATA_WATCH_INTERVAL'] > 0:
+        store.watch(app.config['DATA_WATCH_INTERVAL'])
     app.run(debug=True) 
\ No newline at end of file
@@ -1,45 +1,140 @@
-from flask import Flask, render_template, request, flash, jsonify
+from flask import Flask, render_template, request, flash, jsonify, session
 import pandas as pd
 import json
 import plotly
 import plotly.express as px
 import os
 from waitress import serve
-from werkzeug.utils import secure_filename
+
+from analysis_cache import Analysis, AnalysisCache
+from chart_reduction import binned_counts, reduce_points
+from data_store import shared_store
+from json_provider import install
+from metrics import RequestMetrics, gauges
+from player_filter import search_arguments
+from streaming_ingest import build_figures, iter_csv_chunks, iter_excel_chunks, profile_chunks, spool_upload
+from table_view import DEFAULT_PAGE_SIZE, TableView
+import tasks
+from worker_pool import Overloaded, RequestTimeout, WorkerPool
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'
+install(app)
 
 # Configure upload folder
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'xls', 'xlsx', 'csv', 'xlsm', 'xlsb', 'odf', 'ods', 'odt'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Uploads larger than this are profiled chunk by chunk instead of loaded whole
+app.config['STREAMING_THRESHOLD'] = 20 * 1024 * 1024
+# Chart size limits: above these, bars are binned, scatters downsampled and pies folded
+app.config['CHART_MAX_BARS'] = 2000
+app.config['CHART_MAX_POINTS'] = 5000
+app.config['CHART_MAX_CATEGORIES'] = 50
+# Memory budget for parsed datasets and their charts, shared by all sessions
+app.config['ANALYSIS_CACHE_BYTES'] = 512 * 1024 * 1024
+
+# Processes for upload parsing and player search; 0 runs them in the request thread
+app.config['WORKER_PROCESSES'] = int(os.environ.get('WORKER_PROCESSES', 0))
+# Offloaded requests allowed in flight before new ones are refused; 0 means 4 per worker
+app.config['WORKER_QUEUE'] = int(os.environ.get('WORKER_QUEUE', 0))
+# Seconds an offloaded request may run before it is abandoned
+app.config['REQUEST_TIMEOUT'] = float(os.environ.get('REQUEST_TIMEOUT', 120))
+# Log one JSON line of phase timings per request to the nba.requests logger
+app.config['REQUEST_LOG'] = os.environ.get('REQUEST_LOG', '0') != '0'
+
+DEFAULT_DATA_FILE = 'Active Franchise.xls'
 
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# Parsed uploads and the default dataset, keyed by content hash
+analysis_cache = AnalysisCache(app.config['ANALYSIS_CACHE_BYTES'])
+
+# Player data is loaded once and shared with api.py
+store = shared_store(cache=os.environ.get('DATA_CACHE', '1') != '0')
+
+pool = WorkerPool(app.config['WORKER_PROCESSES'], app.config['WORKER_QUEUE'], app.config['REQUEST_TIMEOUT'])
+# Workers hold the snapshot they were forked with, so a new one gets fresh workers
+store.on_swap(lambda dataset: pool.recycle())
+
+@app.errorhandler(Overloaded)
+def handle_overloaded(e):
+    response = jsonify({'error': str(e)})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+@app.errorhandler(RequestTimeout)
+def handle_request_timeout(e):
+    return jsonify({'error': str(e)}), 504
+
+# Phase timings, request counters and cache/pool gauges at /metrics
+metrics = RequestMetrics(app, log_requests=app.config['REQUEST_LOG'])
+metrics.add_collector(lambda: gauges('analysis_cache', analysis_cache.stats(), 'Upload analysis cache statistic'))
+metrics.add_collector(lambda: gauges('worker_pool', pool.stats(), 'Worker pool statistic'))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def excel_engine(extension):
+    if extension in ('xls', 'xlsx', 'xlsm', 'xlsb'):
+        return 'openpyxl'
+    if extension in ('ods', 'odt', 'odf'):
+        return 'odf'
+    return None
+
 def analyze_data(df):
-    """Analyze any dataframe and create appropriate visualizations"""
+    """Analyze any dataframe and create appropriate visualizations
+
+    Above the configured thresholds charts are built from binned or
+    downsampled data, with the original row count in the title.
+    """
     try:
-        # Make a copy to avoid modifying the original dataframe
-        df = df.copy()
+        max_bars = app.config['CHART_MAX_BARS']
+        max_points = app.config['CHART_MAX_POINTS']
+        max_categories = app.config['CHART_MAX_CATEGORIES']
+        rows = len(df)
         
         # Get numeric columns
         numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
         
         # Create visualizations
         if len(numeric_cols) >= 1:
-            fig1 = px.bar(df, x=df.index, y=numeric_cols[0],
-                          title=f'Distribution of {numeric_cols[0]}')
+            if rows <= max_bars:
+                fig1 = px.bar(df, x=df.index, y=numeric_cols[0],
+                              title=f'Distribution of {numeric_cols[0]}')
+            else:
+                # One bar per row is unreadable and huge at this size; bin the values instead
+                centers, counts, width = binned_counts(df[numeric_cols[0]].to_numpy(dtype='float64'))
+                fig1 = px.bar(x=centers, y=counts, labels={'x': numeric_cols[0], 'y': 'count'},
+                              title=f'Distribution of {numeric_cols[0]} ({rows:,} rows, binned)')
+                fig1.update_traces(width=width)
             
-            fig2 = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1],
-                              title=f'{numeric_cols[0]} vs {numeric_cols[1]}') if len(numeric_cols) >= 2 else None
+            fig2 = None
+            if len(numeric_cols) >= 2:
+                points = df[[numeric_cols[0], numeric_cols[1]]].dropna()
+                x = points[numeric_cols[0]].to_numpy(dtype='float64')
+                y = points[numeric_cols[1]].to_numpy(dtype='float64')
+                if len(points) <= max_points:
+                    fig2 = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1],
+                                      title=f'{numeric_cols[0]} vs {numeric_cols[1]}')
+                else:
+                    keep = reduce_points(x, y, max_points)
+                    fig2 = px.scatter(x=x[keep], y=y[keep], render_mode='webgl',
+                                      labels={'x': numeric_cols[0], 'y': numeric_cols[1]},
+                                      title=f'{numeric_cols[0]} vs {numeric_cols[1]} '
+                                            f'({len(keep):,} of {len(points):,} points shown)')
         else:
-            fig1 = px.bar(df.iloc[:, 0].value_counts(), title=f'Distribution of {df.columns[0]}')
-            fig2 = px.pie(df, names=df.columns[0], title=f'Distribution of {df.columns[0]}')
+            counts = df.iloc[:, 0].value_counts()
+            if len(counts) > max_categories:
+                # Keep the most common values and fold the rest into one slice
+                other = counts.iloc[max_categories:].sum()
+                counts = counts.iloc[:max_categories]
+                counts.loc['Other'] = other
+            fig1 = px.bar(counts, title=f'Distribution of {df.columns[0]}')
+            fig2 = px.pie(names=counts.index.astype(str), values=counts.values,
+                          title=f'Distribution of {df.columns[0]}')
 
         return fig1, fig2, df
 
@@ -50,50 +145,99 @@ def analyze_data(df):
 @app.route('/api/players/search', methods=['GET'])
 def search_players():
     try:
-        # Load the data
-        df = pd.read_csv('nba.csv')  # Ensure the file is present
-
-        # Validate that the dataset exists
-        if df is None or df.empty:
+        data = store.current
+        if data.player_filter is None:
             return jsonify([])
 
-        # Convert column names to lowercase for consistency
-        df.columns = df.columns.str.lower()
+        # Same criteria, paging, sort and fields= projection as api.py
+        try:
+            total, players_list = pool.run(tasks.search_players, data.version, search_arguments(request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # Extract search parameters
-        min_points = float(request.args.get('min_points', 0))
-        min_rebounds = float(request.args.get('min_rebounds', 0))
-        min_assists = float(request.args.get('min_assists', 0))
-        position = request.args.get('position', '').upper()
+        response = jsonify(players_list)
+        response.headers['X-Total-Count'] = str(total)
+        return response
 
-        # Log the search criteria for debugging
-        print(f"🔍 Search criteria: min_points={min_points}, min_rebounds={min_rebounds}, min_assists={min_assists}, position={position}")
+    except (Overloaded, RequestTimeout):
+        raise
+    except Exception as e:
+        print(f"❌ Error in search_players: {str(e)}")
+        return jsonify({"error": str(e)}), 500
 
-        # Filter dataset based on criteria
-        filtered_df = df.copy()
-        if min_points > 0:
-            filtered_df = filtered_df[filtered_df['pts'] >= min_points]
-        if min_rebounds > 0:
-            filtered_df = filtered_df[filtered_df['trb'] >= min_rebounds]
-        if min_assists > 0:
-            filtered_df = filtered_df[filtered_df['ast'] >= min_assists]
-        if position:
-            filtered_df = filtered_df[filtered_df['pos'].str.contains(position, case=False, na=False)]
+@app.route('/api/table/<table_id>', methods=['GET'])
+def get_table_page(table_id):
+    analysis = analysis_cache.get(table_id)
+    if analysis is None:
+        return jsonify({'error': 'Table not found'}), 404
+    table = analysis.table
 
-        # Log the number of results found
-        print(f"✅ Players found: {len(filtered_df)}")
+    try:
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', DEFAULT_PAGE_SIZE))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'page and page_size must be integers'}), 400
 
-        # Return formatted response
-        return jsonify(filtered_df.to_dict(orient="records"))
+    sort = request.args.get('sort') or None
+    # Column filters arrive as filter_<column>=<text>
+    filters = {key[len('filter_'):]: value for key, value in request.args.items() if key.startswith('filter_')}
 
-    except Exception as e:
-        print(f"❌ Error in search_players: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    try:
+        total, rows = table.page(page, page_size, sort, filters)
+    except KeyError as e:
+        return jsonify({'error': f'Unknown column: {e.args[0]}'}), 400
+
+    return jsonify({'columns': table.columns, 'total': total, 'page': page, 'rows': rows})
+
+class UploadError(Exception):
+    """An upload that cannot be charted; the message is shown to the user"""
+
+def analyze_upload(path, extension):
+    """Parse and chart a spooled upload, in a worker process when the pool is enabled
+
+    Returns (df, fig1, fig2, total_rows); total_rows is None unless the file was streamed.
+    """
+    streaming = os.path.getsize(path) > app.config['STREAMING_THRESHOLD']
+
+    if extension == 'csv':
+        if streaming:
+            chunks = iter_csv_chunks(path)
+        else:
+            df = pd.read_csv(path)
+    elif excel_engine(extension):
+        if streaming:
+            chunks = iter_excel_chunks(path, excel_engine(extension))
+        else:
+            df = pd.read_excel(path, engine=excel_engine(extension))
+    else:
+        raise UploadError('Unsupported file format')
+
+    if streaming:
+        # Charts come from single-pass aggregates; the table shows the first rows
+        profile = profile_chunks(chunks)
+        if profile.rows == 0:
+            raise UploadError('File contains no data')
+        fig1, fig2 = build_figures(profile)
+        return profile.preview, fig1, fig2, profile.rows
+
+    if df.empty:
+        raise UploadError('File contains no data')
+
+    fig1, fig2, df = analyze_data(df)
+    if fig1 is None:
+        raise UploadError('Error analyzing data')
+    return df, fig1, fig2, None
+
+def cache_analysis(key, df, fig1, fig2, total_rows=None):
+    """Serialize the figures once and keep everything needed to render the page"""
+    graph1JSON = json.dumps(fig1, cls=plotly.utils.PlotlyJSONEncoder) if fig1 else None
+    graph2JSON = json.dumps(fig2, cls=plotly.utils.PlotlyJSONEncoder) if fig2 else None
+    total_rows = total_rows if total_rows is not None else len(df)
+    return analysis_cache.put(Analysis(key, df, fig1, fig2, graph1JSON, graph2JSON, TableView(df), total_rows))
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
-    uploaded_data = None
-    fig1, fig2 = None, None
+    analysis = None
     
     if request.method == 'POST':
         if 'file' not in request.files:
@@ -106,48 +250,61 @@ def index():
             return render_template('index.html')
 
         if file and allowed_file(file.filename):
+            path = None
             try:
-                if file.filename.endswith('.csv'):
-                    df = pd.read_csv(file)
-                elif file.filename.endswith(('.xls', '.xlsx', '.xlsm', '.xlsb')):
-                    df = pd.read_excel(file, engine='openpyxl')
-                elif file.filename.endswith(('.ods', '.odt', '.odf')):
-                    df = pd.read_excel(file, engine='odf')
-                else:
-                    flash('Unsupported file format')
-                    return render_template('index.html')
+                # Spool to disk so large uploads are never held in memory whole
+                path, digest = spool_upload(file, app.config['UPLOAD_FOLDER'])
+                extension = file.filename.rsplit('.', 1)[1].lower()
+                key = f'{extension}:{digest}'
 
-                if df.empty:
-                    flash('File contains no data')
-                    return render_template('index.html')
+                # An identical re-upload skips parsing and plotting
+                analysis = analysis_cache.get(key)
+                if analysis is None:
+                    df, fig1, fig2, total_rows = pool.run(analyze_upload, path, extension)
+                    analysis = cache_analysis(key, df, fig1, fig2, total_rows)
 
-                fig1, fig2, df = analyze_data(df)
-                if fig1 is None:
-                    flash('Error analyzing data')
-                    return render_template('index.html')
-
-                uploaded_data = df
+                session['analysis'] = key
 
+            except UploadError as e:
+                flash(str(e))
+                return render_template('index.html')
+            except Overloaded:
+                flash('The server is busy, please try again in a moment')
+                return render_template('index.html'), 503
+            except RequestTimeout:
+                flash('The file took too long to process')
+                return render_template('index.html'), 504
             except Exception as e:
                 flash(f'Error processing file: {str(e)}')
                 return render_template('index.html')
+            finally:
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
 
-    if uploaded_data is None:
+    if analysis is None and session.get('analysis'):
+        # Show this session's last upload while it is still cached
+        analysis = analysis_cache.get(session['analysis'])
+
+    if analysis is None:
         try:
-            df = pd.read_excel('Active Franchise.xls')
-            fig1, fig2, df = analyze_data(df)
+            key = analysis_cache.key_for_file(DEFAULT_DATA_FILE)
+            analysis = analysis_cache.get(key)
+            if analysis is None:
+                df = pd.read_excel(DEFAULT_DATA_FILE)
+                fig1, fig2, df = analyze_data(df)
+                analysis = cache_analysis(key, df, fig1, fig2)
         except:
             flash('No data available')
             return render_template('index.html')
 
-    graph1JSON = json.dumps(fig1, cls=plotly.utils.PlotlyJSONEncoder) if fig1 else None
-    graph2JSON = json.dumps(fig2, cls=plotly.utils.PlotlyJSONEncoder) if fig2 else None
-
+    # Rows are fetched page by page from /api/table, so the page size does not grow with the data
     return render_template('index.html', 
-                           graph1JSON=graph1JSON,
-                           graph2JSON=graph2JSON,
-                           stats_table=df.to_dict('records'),
-                           columns=df.columns.tolist())
+                           graph1JSON=analysis.graph1_json,
+                           graph2JSON=analysis.graph2_json,
+                           table_id=analysis.key,
+                           table_rows=len(analysis.frame),
+                           columns=analysis.table.columns,
+                           total_rows=analysis.total_rows)
 
 if __name__ == '__main__':
     import sys
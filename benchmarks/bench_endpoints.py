@@ -0,0 +1,232 @@
+"""Time every api.py and app.py endpoint on synthetic data at several scales.
+
+Scale 1 is roughly the shipped files: 700 player rows in nba.csv, 126k game
+rows in nbaallelo.csv and 12k rows in all_seasons.csv; scale 10 and 100
+multiply all three. Each scale runs in a fresh process through the Flask test
+clients, so the numbers cover routing, the view and serialization but not the
+network. Cached GETs carry a unique query argument, so every request misses
+the response cache. The data and serialize columns are medians of the
+Server-Timing phases reported by metrics.py.
+
+Run from the repository root:
+    python -m benchmarks.bench_endpoints --scales 1 10
+    python -m benchmarks.bench_endpoints --json before.json
+    python -m benchmarks.bench_endpoints --compare before.json
+    python -m benchmarks.bench_endpoints --scales 100 --profile
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+import numpy as np
+
+from benchmarks.synthetic import TEAM_IDS, make_franchises, make_games, make_players, make_seasons
+
+PLAYERS = 700
+GAMES = 63_000
+SEASONS = 12_000
+# A p50 this much slower than the baseline is reported as a regression
+REGRESSION_THRESHOLD = 0.25
+
+
+def write_data(directory, scale):
+    players = make_players(PLAYERS * scale)
+    players.to_csv(os.path.join(directory, 'nba.csv'), index=False)
+    make_games(GAMES * scale).to_csv(os.path.join(directory, 'nbaallelo.csv'), index=False)
+    make_franchises().to_csv(os.path.join(directory, 'frenchise.CSV'), index=False)
+    make_seasons(SEASONS * scale).to_csv(os.path.join(directory, 'all_seasons.csv'), index=False)
+
+
+def endpoint_requests(api, players, admin):
+    """(app, label, method, path, options) for every route; `{n}` is replaced by the request number"""
+    data = api.store.current
+    name = urllib.parse.quote(players['Player'].iloc[len(players) // 2])
+    season_name = urllib.parse.quote(data.seasons_df['player_name'].iloc[0])
+    team, partner = TEAM_IDS[0], TEAM_IDS[1]
+    engine = data.trade_engine
+    trade = {
+        'team': team,
+        'sends': engine.names[engine.rosters[team][:2]].tolist(),
+        'partner': partner,
+        'receives': engine.names[engine.rosters[partner][:1]].tolist()
+    }
+    names = players['Player'].iloc[:50].tolist()
+    return [
+        ('api', 'players', 'GET', '/api/players?search=jo&limit=20&n={n}', {}),
+        ('api', 'teams', 'GET', '/api/teams?n={n}', {}),
+        ('api', 'team', 'GET', f'/api/team/{team}?n={{n}}', {}),
+        ('api', 'player', 'GET', f'/api/player/{name}?n={{n}}', {}),
+        ('api', 'player similar', 'GET', f'/api/player/{name}/similar?n={{n}}', {}),
+        ('api', 'season similar', 'GET', f'/api/player/{season_name}/similar?pool=seasons&n={{n}}', {}),
+        ('api', 'players batch', 'POST', '/api/players/batch', {'json': {'names': names}}),
+        ('api', 'teams batch', 'POST', '/api/teams/batch', {'json': {'teams': TEAM_IDS}}),
+        ('api', 'team trades', 'GET', f'/api/team/{team}/trades?n={{n}}', {}),
+        ('api', 'trades evaluate', 'POST', '/api/trades/evaluate', {'json': {'trades': [trade] * 20}}),
+        ('api', 'players search', 'GET', '/api/players/search?min_points=10&sort=-rebounds,name&limit=100&n={n}', {}),
+        ('api', 'players search columns', 'GET', '/api/players/search?limit=1000&format=columns&n={n}', {}),
+        ('api', 'team elo', 'GET', f'/api/team/{team}/elo?n={{n}}', {}),
+        ('api', 'team elo history', 'GET', f'/api/team/{team}/elo/history?n={{n}}', {}),
+        ('api', 'elo snapshot', 'GET', '/api/elo/snapshot?n={n}', {}),
+        ('api', 'cache stats', 'GET', '/api/cache/stats', {}),
+        ('api', 'admin data', 'GET', '/api/admin/data', admin),
+        ('api', 'admin memory', 'GET', '/api/admin/memory', admin),
+        ('api', 'admin reload', 'POST', '/api/admin/reload', admin),
+        ('api', 'admin profile', 'POST', '/api/admin/profile?seconds=0.01', admin),
+        ('api', 'metrics', 'GET', '/metrics', {}),
+        ('app', 'players search', 'GET', '/api/players/search?min_points=10&sort=-rebounds,name&limit=100', {}),
+        ('app', 'index', 'GET', '/', {}),
+        ('app', 'metrics', 'GET', '/metrics', {}),
+    ]
+
+
+def server_timing(response):
+    """{phase: ms} from the Server-Timing header"""
+    phases = {}
+    for entry in response.headers.get('Server-Timing', '').split(','):
+        phase, _, duration = entry.strip().partition(';dur=')
+        if duration:
+            phases[phase] = float(duration)
+    return phases
+
+
+def summarize(latencies, phases, statuses):
+    latencies = np.array(latencies) * 1000
+    return {
+        'p50': float(np.percentile(latencies, 50)),
+        'p99': float(np.percentile(latencies, 99)),
+        'data': float(np.median([p.get('data', np.nan) for p in phases])),
+        'serialize': float(np.median([p.get('serialize', np.nan) for p in phases])),
+        'errors': sum(status >= 400 for status in statuses)
+    }
+
+
+def time_requests(client, method, path, options, count):
+    latencies, phases, statuses = [], [], []
+    for n in range(count):
+        start = time.perf_counter()
+        response = client.open(path.replace('{n}', str(n)), method=method, **options)
+        response.get_data()
+        latencies.append(time.perf_counter() - start)
+        phases.append(server_timing(response))
+        statuses.append(response.status_code)
+        response.close()
+    return summarize(latencies, phases, statuses)
+
+
+def time_uploads(client, players, count):
+    """POST / with a fresh CSV each time so parsing and charting are never cached, then page its table"""
+    upload = {'latencies': [], 'phases': [], 'statuses': []}
+    keys = []
+    for n in range(count):
+        content = players.assign(Rk=players['Rk'] + n).to_csv(index=False).encode()
+        keys.append('csv:' + hashlib.sha256(content).hexdigest())
+        start = time.perf_counter()
+        response = client.post('/', data={'file': (io.BytesIO(content), 'players.csv')},
+                               content_type='multipart/form-data')
+        response.get_data()
+        upload['latencies'].append(time.perf_counter() - start)
+        upload['phases'].append(server_timing(response))
+        upload['statuses'].append(response.status_code)
+        response.close()
+    results = {'app upload': summarize(upload['latencies'], upload['phases'], upload['statuses'])}
+    results['app table'] = time_requests(client, 'GET', f'/api/table/{keys[-1]}?page={{n}}&sort=-PTS&filter_Tm=A',
+                                         {}, count)
+    return results
+
+
+def worker(directory, count, profile_path):
+    """Run every endpoint `count` times against the data in `directory`; prints one JSON report"""
+    os.chdir(directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import api
+        import app
+    from profiler import SamplingProfiler
+
+    # The admin endpoints are closed without a token
+    api.app.config['ADMIN_TOKEN'] = 'benchmark'
+    admin = {'headers': {'X-Admin-Token': 'benchmark'}}
+    players = api.store.current.players_df
+    clients = {'api': api.app.test_client(), 'app': app.app.test_client()}
+    profiler = SamplingProfiler().start() if profile_path else None
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for app_name, label, method, path, options in endpoint_requests(api, players, admin):
+            results[f'{app_name} {label}'] = time_requests(clients[app_name], method, path, options, count)
+        results.update(time_uploads(clients['app'], players, count))
+    if profiler is not None:
+        with open(profile_path, 'w') as out:
+            out.write(profiler.stop().collapsed())
+    print(json.dumps(results))
+
+
+def run_scale(scale, count, profile):
+    with tempfile.TemporaryDirectory() as directory:
+        write_data(directory, scale)
+        profile_path = os.path.abspath(f'profile-{scale}x.txt') if profile else ''
+        command = [sys.executable, '-m', 'benchmarks.bench_endpoints', '--worker', directory,
+                   str(count), profile_path]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        environment = dict(os.environ, PYTHONPATH=root)
+        output = subprocess.run(command, check=True, capture_output=True, text=True, env=environment).stdout
+        if profile_path:
+            print(f'Collapsed stacks written to {profile_path}')
+        return json.loads(output.strip().splitlines()[-1])
+
+
+def report(scale, results, baseline):
+    print(f'\nscale {scale}x')
+    print(f"{'endpoint':<28} {'p50 (ms)':>9} {'p99 (ms)':>9} {'data':>8} {'serialize':>10} {'errors':>7}")
+    regressions = []
+    for endpoint, result in results.items():
+        flag = ''
+        before = baseline.get(endpoint)
+        if before is not None and result['p50'] > before['p50'] * (1 + REGRESSION_THRESHOLD):
+            flag = f"  slower than {before['p50']:.2f}"
+            regressions.append(endpoint)
+        print(f"{endpoint:<28} {result['p50']:>9.2f} {result['p99']:>9.2f} {result['data']:>8.2f} "
+              f"{result['serialize']:>10.2f} {result['errors']:>7}{flag}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], int(sys.argv[3]), sys.argv[4] if len(sys.argv) > 4 else '')
+        return
+
+    parser = argparse.ArgumentParser(description='Benchmark every endpoint of api.py and app.py')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--requests', type=int, default=30, help='requests per endpoint')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='flag endpoints slower than in this earlier --json file')
+    parser.add_argument('--profile', action='store_true', help='write collapsed stacks per scale')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    all_results = {}
+    regressions = 0
+    for scale in args.scales:
+        results = run_scale(scale, args.requests, args.profile)
+        all_results[str(scale)] = results
+        regressions += len(report(scale, results, baseline.get(str(scale), {})))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(all_results, f, indent=2)
+    if regressions:
+        sys.exit(f'\n{regressions} endpoint(s) more than {REGRESSION_THRESHOLD:.0%} slower than the baseline')
+
+
+if __name__ == '__main__':
+    main()
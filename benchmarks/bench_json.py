@@ -0,0 +1,56 @@
+"""Compare JSON serialization throughput of Flask's default provider and FastJSONProvider.
+
+Serializes player search pages and team recent games through each provider's
+response() and reports output bytes per second and time per response.
+Run from the repository root:  python -m benchmarks.bench_json
+"""
+import timeit
+
+import pandas as pd
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.synthetic import make_franchises, make_games, make_players
+from json_provider import FastJSONProvider, orjson
+from player_filter import PlayerFilter
+from team_index import TeamIndex
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def throughput(provider, payload):
+    body = provider.response(payload).get_data()
+    number = max(1, 2_000_000 // max(len(body), 1))
+    seconds = min(timeit.repeat(lambda: provider.response(payload).get_data(), number=number, repeat=3)) / number
+    return len(body), len(body) / seconds
+
+
+def main():
+    app = Flask(__name__)
+    providers = [('default', DefaultJSONProvider(app)), ('fast', FastJSONProvider(app))]
+    print(f"orjson: {'yes' if orjson is not None else 'no (standard library fallback)'}")
+    print(f"{'payload':>22} {'provider':>9} {'format':>8} {'bytes':>10} {'MB/s':>9} {'ms':>9}")
+
+    with app.app_context():
+        for size in SIZES:
+            player_filter = PlayerFilter(make_players(size))
+            _, records = player_filter.search(limit=None)
+            _, columns = player_filter.search(limit=None, orient='columns')
+            for name, provider in providers:
+                # The default provider cannot encode NumPy arrays, so it only gets records
+                layouts = [('records', records)] + ([('columns', columns)] if name == 'fast' else [])
+                for layout, payload in layouts:
+                    nbytes, rate = throughput(provider, payload)
+                    print(f"{f'search {size} rows':>22} {name:>9} {layout:>8} {nbytes:>10} {rate / 1e6:>9.1f} {nbytes / rate * 1000:>9.3f}")
+
+        games = make_games(50_000)
+        games['date_game'] = pd.to_datetime(games['date_game'])
+        team_index = TeamIndex(games, make_franchises())
+        recent = {team_id: team_index.recent_games(team_id) for team_id in team_index.slices}
+        for name, provider in providers:
+            nbytes, rate = throughput(provider, recent)
+            print(f"{'recent games, all teams':>22} {name:>9} {'records':>8} {nbytes:>10} {rate / 1e6:>9.1f} {nbytes / rate * 1000:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Time similar-player queries by brute force and through the KD-tree index.
+
+Run from the repository root:  python -m benchmarks.bench_similarity
+"""
+import timeit
+
+import numpy as np
+
+from benchmarks.synthetic import make_seasons
+from player_similarity import cKDTree, season_similarity
+
+SIZES = [12_000, 100_000, 1_000_000]
+QUERIES = 50
+
+
+def query_ms(index, rows, metric):
+    seconds = min(timeit.repeat(lambda: [index.neighbors(row, k=10, metric=metric) for row in rows],
+                                number=1, repeat=3))
+    return seconds / len(rows) * 1000
+
+
+def main():
+    if cKDTree is None:
+        print('scipy is not installed; only brute force is measured')
+    print(f"{'rows':>10} {'metric':>10} {'build (s)':>10} {'brute (ms)':>11} {'tree (ms)':>10} {'same top 10':>12}")
+    for size in SIZES:
+        seasons = make_seasons(size)
+        rows = np.random.default_rng(1).integers(0, size, QUERIES)
+        brute = season_similarity(seasons, use_tree=False)
+        start = timeit.default_timer()
+        tree = season_similarity(seasons, use_tree=True) if cKDTree is not None else None
+        build = timeit.default_timer() - start
+        for metric in ('cosine', 'euclidean'):
+            brute_ms = query_ms(brute, rows, metric)
+            if tree is None:
+                print(f'{size:>10} {metric:>10} {"-":>10} {brute_ms:>11.3f} {"-":>10} {"-":>12}')
+                continue
+            tree_ms = query_ms(tree, rows, metric)
+            same = all([r for r, _ in brute.neighbors(row, 10, metric)] == [r for r, _ in tree.neighbors(row, 10, metric)]
+                       for row in rows)
+            print(f'{size:>10} {metric:>10} {build:>10.3f} {brute_ms:>11.3f} {tree_ms:>10.3f} {str(same):>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Measure API data load time and resident memory with and without the binary cache.
+
+Each measurement runs in a fresh interpreter so RSS reflects one worker start.
+Run from the repository root:  python -m benchmarks.bench_startup [game rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_games, make_franchises, make_players
+from process_memory import memory_usage
+
+MODES = [('csv', False), ('cache cold', True), ('cache warm', True)]
+
+
+def child(directory, cache):
+    import pandas  # noqa: F401  Keep import cost out of the measurement
+    from data_store import load_dataset
+
+    baseline = memory_usage()['rss']
+    start = time.perf_counter()
+    dataset = load_dataset(os.path.join(directory, 'nba.csv'),
+                           os.path.join(directory, 'nbaallelo.csv'),
+                           os.path.join(directory, 'frenchise.CSV'),
+                           cache=cache)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'rss': memory_usage()['rss'] - baseline, 'games': len(dataset.teams_df)}))
+
+
+def main():
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as directory:
+        make_players(5_000).to_csv(os.path.join(directory, 'nba.csv'), index=False)
+        make_games(n_games // 2).to_csv(os.path.join(directory, 'nbaallelo.csv'), index=False)
+        make_franchises().to_csv(os.path.join(directory, 'frenchise.CSV'), index=False)
+
+        print(f"{'mode':>12} {'rows':>10} {'load (s)':>9} {'RSS delta (MiB)':>16}")
+        for name, cache in MODES:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_startup', '--child', directory, str(int(cache))],
+                check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{name:>12} {result['games']:>10} {result['seconds']:>9.3f} {result['rss'] / 2**20:>16.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3] == '1')
+    else:
+        main()
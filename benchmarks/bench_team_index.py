@@ -0,0 +1,48 @@
+"""Compare the per-request team scan with the precomputed TeamIndex lookup.
+
+Run from the repository root:  python -m benchmarks.bench_team_index
+"""
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_games, make_franchises
+from team_index import TeamIndex
+
+SIZES = [10_000, 60_000, 250_000, 1_000_000]
+TEAM_ID = 'BOS'
+
+
+def scan_lookup(teams_df, team_id):
+    # The original get_team_stats body: filter, sort and mask on every request
+    team_games = teams_df[teams_df['team_id'] == team_id].sort_values('date_game', ascending=False)
+    recent = team_games.head(10)[['date_game', 'game_result', 'pts', 'opp_pts', 'elo_n']].to_dict('records')
+    return (recent,
+            len(team_games[team_games['game_result'] == 'W']),
+            len(team_games[team_games['game_result'] == 'L']),
+            float(team_games['pts'].mean()),
+            float(team_games['opp_pts'].mean()),
+            float(team_games.iloc[0]['elo_n']))
+
+
+def index_lookup(index, team_id):
+    return index.recent_games(team_id), index.stats(team_id)
+
+
+def main():
+    print(f"{'game rows':>10} {'build (s)':>10} {'scan (ms)':>10} {'index (ms)':>11}")
+    for n_games in SIZES:
+        teams_df = make_games(n_games // 2)
+        teams_df['date_game'] = pd.to_datetime(teams_df['date_game'])
+
+        start = timeit.default_timer()
+        index = TeamIndex(teams_df, make_franchises())
+        build = timeit.default_timer() - start
+
+        scan = min(timeit.repeat(lambda: scan_lookup(teams_df, TEAM_ID), number=5, repeat=3)) / 5
+        lookup = min(timeit.repeat(lambda: index_lookup(index, TEAM_ID), number=200, repeat=3)) / 200
+        print(f'{len(teams_df):>10} {build:>10.3f} {scan * 1000:>10.3f} {lookup * 1000:>11.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Report per-worker memory when several processes load the same dataset.
+
+With the memory-mapped cache the column data is shared through the page
+cache, so each extra worker should add little private memory compared with
+parsing the CSVs in every process.
+Run from the repository root:  python -m benchmarks.bench_workers [workers] [game rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_games, make_franchises, make_players
+
+MiB = 2 ** 20
+
+
+def worker(directory, cache):
+    from data_store import load_dataset
+    from process_memory import memory_usage
+
+    load_dataset(os.path.join(directory, 'nba.csv'),
+                 os.path.join(directory, 'nbaallelo.csv'),
+                 os.path.join(directory, 'frenchise.CSV'),
+                 cache=cache)
+    print(json.dumps(memory_usage()), flush=True)
+    # Stay alive until every sibling has reported, so shared pages are counted together
+    sys.stdin.read()
+
+
+def run(directory, cache, n_workers):
+    command = [sys.executable, '-m', 'benchmarks.bench_workers', '--worker', directory, str(int(cache))]
+    processes = [subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(n_workers)]
+    reports = [json.loads(process.stdout.readline()) for process in processes]
+    for process in processes:
+        process.communicate('')
+    return reports
+
+
+def main():
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_games = int(sys.argv[2]) if len(sys.argv) > 2 else 400_000
+    with tempfile.TemporaryDirectory() as directory:
+        make_players(5_000).to_csv(os.path.join(directory, 'nba.csv'), index=False)
+        make_games(n_games // 2).to_csv(os.path.join(directory, 'nbaallelo.csv'), index=False)
+        make_franchises().to_csv(os.path.join(directory, 'frenchise.CSV'), index=False)
+        # Write the cache once so the measured workers all take the warm path
+        run(directory, True, 1)
+
+        print(f"{'mode':>8} {'workers':>8} {'RSS/worker':>11} {'private/worker':>15} {'PSS total':>10}  (MiB)")
+        for name, cache in [('csv', False), ('mmap', True)]:
+            reports = run(directory, cache, n_workers)
+            rss = sum(report['rss'] for report in reports) / n_workers
+            private = sum(report.get('private', report['rss']) for report in reports) / n_workers
+            pss = sum(report.get('pss', report['rss']) for report in reports)
+            print(f'{name:>8} {n_workers:>8} {rss / MiB:>11.1f} {private / MiB:>15.1f} {pss / MiB:>10.1f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], sys.argv[3] == '1')
+    else:
+        main()
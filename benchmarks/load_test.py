@@ -0,0 +1,151 @@
+"""Load-test the stats API at increasing concurrency and report latency percentiles.
+
+Without --url a server is started on synthetic data through serve.py, once per
+--workers value, so the in-thread and process pool modes can be compared.
+Each request carries a unique query argument so the response cache is bypassed.
+
+Run from the repository root:
+    python -m benchmarks.load_test --workers 0 3
+    python -m benchmarks.load_test --url http://127.0.0.1:5000
+"""
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.synthetic import TEAM_IDS, make_franchises, make_games, make_players
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEVELS = [1, 4, 16, 64]
+
+
+def request_paths(player_names):
+    """Endlessly cycle through a mix of cheap lookups and heavy team/search requests"""
+    rng = np.random.default_rng(0)
+    for i in itertools.count():
+        kind = i % 4
+        if kind == 0:
+            yield f'/api/team/{TEAM_IDS[rng.integers(len(TEAM_IDS))]}?n={i}'
+        elif kind == 1:
+            yield f'/api/players/search?min_points={rng.integers(0, 25)}&sort=-rebounds,name&limit=100&n={i}'
+        elif kind == 2:
+            yield f'/api/player/{urllib.request.quote(player_names[rng.integers(len(player_names))])}?n={i}'
+        else:
+            yield f'/api/players?search=jo&limit=20&n={i}'
+
+
+def fetch(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def run_level(base_url, paths, concurrency, duration):
+    lock = threading.Lock()
+    results = []
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            with lock:
+                path = next(paths)
+            result = fetch(base_url + path)
+            with lock:
+                results.append(result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - start
+
+    statuses = np.array([status for status, _ in results])
+    latencies = np.array([latency for status, latency in results if status == 200]) * 1000
+    return {
+        'requests': len(results),
+        'rps': len(results) / elapsed,
+        'p50': float(np.percentile(latencies, 50)) if len(latencies) else float('nan'),
+        'p99': float(np.percentile(latencies, 99)) if len(latencies) else float('nan'),
+        'rejected': int((statuses == 503).sum()),
+        'timeouts': int((statuses == 504).sum()),
+        'errors': int(((statuses != 200) & (statuses != 503) & (statuses != 504)).sum())
+    }
+
+
+def report(label, base_url, player_names, levels, duration):
+    paths = request_paths(player_names)
+    print(f"\n{label}")
+    print(f"{'clients':>8} {'requests':>9} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'503':>5} {'504':>5} {'other':>6}")
+    for concurrency in levels:
+        result = run_level(base_url, paths, concurrency, duration)
+        print(f"{concurrency:>8} {result['requests']:>9} {result['rps']:>8.1f} {result['p50']:>9.2f} "
+              f"{result['p99']:>9.2f} {result['rejected']:>5} {result['timeouts']:>5} {result['errors']:>6}")
+
+
+def wait_until_ready(base_url, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        if fetch(base_url + '/api/teams')[0] == 200:
+            return
+        time.sleep(0.5)
+    raise RuntimeError('Server did not start in time')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test api.py')
+    parser.add_argument('--url', help='test an already running server instead of starting one')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 3])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--levels', type=int, nargs='+', default=LEVELS)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per concurrency level')
+    parser.add_argument('--games', type=int, default=200_000)
+    parser.add_argument('--port', type=int, default=5057)
+    args = parser.parse_args()
+
+    players = make_players(5_000)
+    player_names = players['Player'].tolist()
+    if args.url:
+        report(args.url, args.url.rstrip('/'), player_names, args.levels, args.duration)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        players.to_csv(os.path.join(directory, 'nba.csv'), index=False)
+        make_games(args.games // 2).to_csv(os.path.join(directory, 'nbaallelo.csv'), index=False)
+        make_franchises().to_csv(os.path.join(directory, 'frenchise.CSV'), index=False)
+        base_url = f'http://127.0.0.1:{args.port}'
+        environment = dict(os.environ, PYTHONPATH=ROOT)
+
+        for workers in args.workers:
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, 'serve.py'), 'api', '--port', str(args.port),
+                 '--threads', str(args.threads), '--workers', str(workers)],
+                cwd=directory, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_ready(base_url, process)
+                report(f'{args.threads} threads, {workers} worker processes', base_url,
+                       player_names, args.levels, args.duration)
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+TEAM_IDS = [
+    'ATL', 'BOS', 'BRK', 'CHO', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW',
+    'HOU', 'IND', 'LAC', 'LAL', 'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK',
+    'OKC', 'ORL', 'PHI', 'PHO', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS'
+]
+
+
+def make_games(n_games, seed=0):
+    """Build a synthetic nbaallelo-style game log with two rows per game"""
+    rng = np.random.default_rng(seed)
+    teams = np.array(TEAM_IDS)
+    home = rng.integers(0, len(teams), n_games)
+    away = (home + rng.integers(1, len(teams), n_games)) % len(teams)
+    dates = pd.Timestamp('1947-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 365 * 70, n_games)), unit='D')
+    home_pts = rng.integers(80, 130, n_games)
+    away_pts = rng.integers(80, 130, n_games)
+    home_elo = rng.normal(1500, 100, n_games).round(2)
+    away_elo = rng.normal(1500, 100, n_games).round(2)
+    game_ids = np.arange(n_games)
+
+    def side(team, opp, pts, opp_pts, elo, opp_elo, location, is_copy):
+        return pd.DataFrame({
+            'gameorder': game_ids + 1,
+            'game_id': game_ids.astype(str),
+            'lg_id': 'NBA',
+            '_iscopy': is_copy,
+            'year_id': dates.year,
+            'date_game': dates.strftime('%m/%d/%Y'),
+            'seasongame': 1,
+            'is_playoffs': 0,
+            'team_id': teams[team],
+            'fran_id': teams[team],
+            'pts': pts,
+            'elo_i': elo,
+            'elo_n': elo + rng.normal(0, 10, n_games).round(2),
+            'win_equiv': 41.0,
+            'opp_id': teams[opp],
+            'opp_fran': teams[opp],
+            'opp_pts': opp_pts,
+            'opp_elo_i': opp_elo,
+            'opp_elo_n': opp_elo,
+            'game_location': location,
+            'game_result': np.where(pts > opp_pts, 'W', 'L'),
+            'forecast': 0.5,
+            'notes': None
+        })
+
+    games = pd.concat([
+        side(home, away, home_pts, away_pts, home_elo, away_elo, 'H', 0),
+        side(away, home, away_pts, home_pts, away_elo, home_elo, 'A', 1),
+    ])
+    return games.sort_values('gameorder', kind='stable').reset_index(drop=True)
+
+
+def make_franchises():
+    """Build a franchise table with one row per synthetic team"""
+    return pd.DataFrame({
+        'Team': TEAM_IDS,
+        'Full_Name': [f'{team} Franchise' for team in TEAM_IDS],
+        'League': 'NBA',
+        'Conference': ['East' if i % 2 else 'West' for i in range(len(TEAM_IDS))],
+        'Division': 'Synthetic'
+    })
+
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG-SG', 'SF-PF']
+FIRST_NAMES = ['LeBron', 'Nikola', 'Luka', 'Giannis', 'Jayson', 'Stephen', 'Kevin', 'Joel', 'Anthony', 'Dāvis']
+LAST_NAMES = ['James', 'Jokić', 'Dončić', 'Antetokounmpo', 'Tatum', 'Curry', 'Durant', 'Embiid', 'Edwards', 'Bertāns']
+
+
+def make_players(n_players, seed=0):
+    """Build a synthetic nba.csv-style per-game stats table"""
+    rng = np.random.default_rng(seed)
+    first = np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), n_players)]
+    last = np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), n_players)]
+    names = [f'{a} {b} {i}' for i, (a, b) in enumerate(zip(first, last))]
+    fga = rng.uniform(0, 22, n_players).round(1)
+    fg = (fga * rng.uniform(0.35, 0.6, n_players)).round(1)
+    three_pa = rng.uniform(0, 9, n_players).round(1)
+    three_p = (three_pa * rng.uniform(0.25, 0.45, n_players)).round(1)
+    fta = rng.uniform(0, 10, n_players).round(1)
+    ft = (fta * rng.uniform(0.6, 0.92, n_players)).round(1)
+    orb = rng.uniform(0, 4, n_players).round(1)
+    drb = rng.uniform(0, 10, n_players).round(1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        players = pd.DataFrame({
+            'Rk': np.arange(1, n_players + 1),
+            'Player': names,
+            'Pos': np.array(POSITIONS)[rng.integers(0, len(POSITIONS), n_players)],
+            'Age': rng.integers(19, 40, n_players),
+            'Tm': np.array(TEAM_IDS)[rng.integers(0, len(TEAM_IDS), n_players)],
+            'G': rng.integers(1, 83, n_players),
+            'GS': rng.integers(0, 83, n_players),
+            'MP': rng.uniform(2, 38, n_players).round(1),
+            'FG': fg,
+            'FGA': fga,
+            'FG%': np.where(fga > 0, (fg / fga).round(3), np.nan),
+            '3P': three_p,
+            '3PA': three_pa,
+            '3P%': np.where(three_pa > 0, (three_p / three_pa).round(3), np.nan),
+            'FT': ft,
+            'FTA': fta,
+            'FT%': np.where(fta > 0, (ft / fta).round(3), np.nan),
+            'ORB': orb,
+            'DRB': drb,
+            'TRB': (orb + drb).round(1),
+            'AST': rng.uniform(0, 11, n_players).round(1),
+            'STL': rng.uniform(0, 2.5, n_players).round(1),
+            'BLK': rng.uniform(0, 3, n_players).round(1),
+            'TOV': rng.uniform(0, 5, n_players).round(1),
+            'PF': rng.uniform(0, 4, n_players).round(1),
+            'PTS': (2 * fg + three_p + ft).round(1),
+        })
+    return players
+
+
+def make_seasons(n_rows, seed=0):
+    """Build a synthetic all_seasons.csv-style table, about 12 seasons per player"""
+    rng = np.random.default_rng(seed)
+    players = rng.integers(0, max(n_rows // 12, 1), n_rows)
+    first = np.array(FIRST_NAMES)[players % len(FIRST_NAMES)]
+    last = np.array(LAST_NAMES)[(players // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    start = 1996 + rng.integers(0, 27, n_rows)
+    return pd.DataFrame({
+        'player_name': [f'{a} {b} {i}' for a, b, i in zip(first, last, players)],
+        'team_abbreviation': np.array(TEAM_IDS)[rng.integers(0, len(TEAM_IDS), n_rows)],
+        'age': rng.integers(19, 40, n_rows).astype('float64'),
+        'gp': rng.integers(1, 83, n_rows),
+        'pts': rng.gamma(2.0, 4.0, n_rows).round(1),
+        'reb': rng.gamma(2.0, 2.0, n_rows).round(1),
+        'ast': rng.gamma(1.5, 1.5, n_rows).round(1),
+        'net_rating': rng.normal(-2, 10, n_rows).round(1),
+        'oreb_pct': rng.uniform(0, 0.15, n_rows).round(3),
+        'dreb_pct': rng.uniform(0.05, 0.3, n_rows).round(3),
+        'usg_pct': rng.uniform(0.1, 0.35, n_rows).round(3),
+        'ts_pct': rng.uniform(0.4, 0.65, n_rows).round(3),
+        'ast_pct': rng.uniform(0, 0.45, n_rows).round(3),
+        'season': [f'{year}-{(year + 1) % 100:02d}' for year in start]
+    })
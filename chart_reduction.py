@@ -0,0 +1,67 @@
+import numpy as np
+
+HISTOGRAM_BINS = 50
+STRATA = 50
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the series' shape
+
+    `x` must be sorted. The first and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    selected = np.empty(n_out, dtype='int64')
+    selected[0] = a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area)) if stop > start else start
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def stratified_sample(x, n_out, strata=STRATA, seed=0):
+    """Indices of a random sample spread proportionally over quantile strata of `x`
+
+    Every non-empty stratum keeps at least one point, so sparse tails stay visible.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+
+    cuts = np.quantile(x, np.linspace(0, 1, strata + 1)[1:-1])
+    codes = np.searchsorted(cuts, x, side='right')
+    sizes = np.bincount(codes, minlength=strata)
+    quota = np.where(sizes > 0, np.maximum(1, np.floor(sizes * n_out / n)), 0).astype('int64')
+
+    # Rank rows within their stratum in random order and keep each stratum's first `quota`
+    keys = np.random.default_rng(seed).random(n)
+    order = np.lexsort((keys, codes))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(n) - starts[codes[order]]
+    return np.sort(order[rank < quota[codes[order]]])
+
+
+def reduce_points(x, y, n_out):
+    """Indices for plotting at most about `n_out` points: LTTB for sorted x, else stratified"""
+    if len(x) <= n_out:
+        return np.arange(len(x))
+    if np.all(x[1:] >= x[:-1]):
+        return lttb(x, y, n_out)
+    return stratified_sample(x, n_out)
+
+
+def binned_counts(values, bins=HISTOGRAM_BINS):
+    """Histogram of the finite values as (bin centers, counts, bin width)"""
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts, edges[1] - edges[0]
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+CACHE_SUFFIX = '.npcache'
+FORMAT_VERSION = 3
+# String columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compact_dtypes(df):
+    """Store repetitive strings as categoricals and downcast integer-valued numerics
+
+    Fractional floats keep float64 so values served by the API round-trip
+    exactly; integer-valued floats without NaN become the narrowest int.
+    Near-unique strings such as names and ids stay plain objects, since their
+    categories would cost as much as the strings themselves.
+    """
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            continue
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            if series.notna().all() and (series % 1 == 0).all():
+                df[column] = pd.to_numeric(series.astype('int64'), downcast='integer')
+        elif series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+            # Team, position and result columns repeat a handful of values
+            df[column] = series.astype('category')
+    return df
+
+
+def _cache_dir(path):
+    return path + CACHE_SUFFIX
+
+
+def _write_cache(df, directory, source):
+    tmp = f'{directory}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        entry = {'name': column, 'file': f'{position}.npy'}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Codes are memory-mapped; only the distinct values are loaded per process
+            entry['kind'] = 'category'
+            entry['categories'] = f'{position}.categories.npy'
+            np.save(os.path.join(tmp, entry['file']), series.cat.codes.to_numpy())
+            np.save(os.path.join(tmp, entry['categories']), series.cat.categories.astype(str).to_numpy(dtype='U'))
+        elif series.dtype == object or pd.api.types.is_string_dtype(series):
+            # Fixed-width text plus a missing-value mask; strings are rebuilt per process either way
+            entry['kind'] = 'text'
+            entry['missing'] = f'{position}.missing.npy'
+            missing = series.isna().to_numpy()
+            np.save(os.path.join(tmp, entry['file']), series.where(~missing, '').astype(str).to_numpy(dtype='U'))
+            np.save(os.path.join(tmp, entry['missing']), missing)
+        else:
+            entry['kind'] = 'array'
+            np.save(os.path.join(tmp, entry['file']), series.to_numpy())
+        columns.append(entry)
+
+    with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+        json.dump({'format': FORMAT_VERSION, 'source': source, 'rows': len(df), 'columns': columns}, f)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+
+
+def _read_cache(directory, manifest):
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'array':
+            data[entry['name']] = values
+            continue
+        if entry['kind'] == 'text':
+            text = values.astype(object)
+            text[np.load(os.path.join(directory, entry['missing']))] = np.nan
+            data[entry['name']] = text
+            continue
+        categories = np.load(os.path.join(directory, entry['categories']))
+        data[entry['name']] = pd.Categorical.from_codes(values, categories.astype(object))
+    # copy=False keeps every column backed by the memory-mapped files, so
+    # processes loading the same cache share one physical copy via the page cache
+    return pd.DataFrame(data, copy=False)
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == FORMAT_VERSION else None
+
+
+def load_table(path, prepare=None, cache=True):
+    """Read a CSV through a typed, memory-mapped .npy cache kept next to it
+
+    `prepare(df)` runs on the freshly parsed CSV before it is cached, so
+    parsing, filtering and type conversion are only paid when the source
+    checksum changes.
+    """
+    def parse():
+        df = pd.read_csv(path)
+        if prepare is not None:
+            df = prepare(df)
+        return compact_dtypes(df.reset_index(drop=True))
+
+    if not cache:
+        return parse()
+
+    directory = _cache_dir(path)
+    stat = os.stat(path)
+    manifest = _read_manifest(directory)
+    if manifest is not None:
+        source = manifest['source']
+        if source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+            return _read_cache(directory, manifest)
+        if source['size'] == stat.st_size and source['sha1'] == file_checksum(path):
+            # Touched but unchanged: refresh the recorded mtime and reuse the cache
+            source['mtime_ns'] = stat.st_mtime_ns
+            with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f)
+            return _read_cache(directory, manifest)
+
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': file_checksum(path)}
+    df = parse()
+    try:
+        _write_cache(df, directory, source)
+    except OSError as e:
+        print(f"Error writing cache for {path}: {str(e)}")
+    return df
@@ -1,97 +1,148 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import scipy.stats as stats
 import os
+import io
+from matplotlib.figure import Figure
+
+from name_search import NameSearchIndex
+
+# Radar axes with the per-game value each one is normalized against
+RADAR_CATEGORIES = ['Scoring', 'Rebounding', 'Playmaking', 'Efficiency', 'Defense']
+# Rendered radar charts kept in memory, roughly 150 KB each
+RADAR_CACHE_SIZE = 128
+
+DETAILED_STATS = {
+    'Games Played': 'G',
+    'Minutes per Game': 'MP',
+    'Field Goals per Game': 'FG',
+    'Field Goal Attempts': 'FGA',
+    '3-Pointers per Game': '3P',
+    '3-Point Attempts': '3PA',
+    'Free Throws per Game': 'FT',
+    'Free Throw Attempts': 'FTA',
+    'Offensive Rebounds': 'ORB',
+    'Defensive Rebounds': 'DRB',
+    'Steals per Game': 'STL',
+    'Blocks per Game': 'BLK',
+    'Turnovers': 'TOV',
+    'Personal Fouls': 'PF'
+}
+
+def file_signature(path):
+    """Cache key that changes whenever the file is replaced or edited"""
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime_ns
+
+@st.cache_resource(max_entries=2)
+def read_players(signature):
+    """Parse the players file once per version instead of on every rerun"""
+    return pd.read_csv(signature[0])
 
 def load_data():
     try:
         # Load player data
-        players_df = pd.read_csv('nba.csv')
-        return players_df
+        signature = file_signature('nba.csv')
+        return signature, read_players(signature)
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return None
+        return None, None
+
+@st.cache_resource(max_entries=2)
+def load_search_index(signature):
+    """Build the player name search index once per data version"""
+    return NameSearchIndex(read_players(signature)['Player'].astype(str))
+
+class PlayerViews:
+    """Everything the player page shows, computed for all players at once"""
+
+    def __init__(self, players_df):
+        # The first row per player, as the page has always shown
+        players = players_df.drop_duplicates('Player')
+        players = players.set_index(players['Player'].astype(str))
+        self.players = players
+
+        radar = np.column_stack([
+            players['PTS'] / 30,  # Normalize against 30 PPG
+            players['TRB'] / 15,  # Normalize against 15 RPG
+            players['AST'] / 10,  # Normalize against 10 APG
+            players['FG%'],  # Already normalized
+            (players['STL'] + players['BLK']) / 5  # Normalize against 5 stocks
+        ])
+        self.radar = dict(zip(players.index, map(tuple, radar.tolist())))
+
+        self.detailed = players[list(DETAILED_STATS.values())].set_axis(list(DETAILED_STATS), axis=1)
 
-def display_player_stats(player_data):
+    def __contains__(self, name):
+        return name in self.radar
+
+    def row(self, name):
+        return self.players.loc[name]
+
+    def detailed_stats(self, name):
+        return self.detailed.loc[[name]].T.set_axis(['Value'], axis=1)
+
+@st.cache_resource(max_entries=2)
+def load_player_views(signature):
+    return PlayerViews(read_players(signature))
+
+@st.cache_data(max_entries=RADAR_CACHE_SIZE)
+def render_radar(values):
+    """PNG of the radar chart for one radar vector
+
+    The figure is built without pyplot, so nothing registers it globally,
+    and only the encoded image is kept.
+    """
+    fig = Figure(figsize=(8, 8))
+    ax = fig.add_subplot(111, polar=True)
+
+    values = list(values)
+    values += values[:1]  # Repeat first value to close the polygon
+
+    # Compute angle for each category
+    angles = [n / float(len(RADAR_CATEGORIES)) * 2 * np.pi for n in range(len(RADAR_CATEGORIES))]
+    angles += angles[:1]  # Repeat first angle to close the polygon
+
+    ax.plot(angles, values)
+    ax.fill(angles, values, alpha=0.25)
+    ax.set_xticks(angles[:-1], RADAR_CATEGORIES)
+    ax.set_title("Player Attribute Radar")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=200)
+    return buffer.getvalue()
+
+def display_player_stats(views, player_name):
     """Display player statistics in a clean format"""
+    player = views.row(player_name)
+
     # Create three columns for basic stats
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Points per Game", f"{player_data['PTS'].values[0]:.1f}")
+        st.metric("Points per Game", f"{player['PTS']:.1f}")
     with col2:
-        st.metric("Rebounds per Game", f"{player_data['TRB'].values[0]:.1f}")
+        st.metric("Rebounds per Game", f"{player['TRB']:.1f}")
     with col3:
-        st.metric("Assists per Game", f"{player_data['AST'].values[0]:.1f}")
+        st.metric("Assists per Game", f"{player['AST']:.1f}")
     
     # Create three more columns for advanced stats
     col4, col5, col6 = st.columns(3)
     
     with col4:
-        st.metric("Field Goal %", f"{player_data['FG%'].values[0]:.1%}")
+        st.metric("Field Goal %", f"{player['FG%']:.1%}")
     with col5:
-        st.metric("3-Point %", f"{player_data['3P%'].values[0]:.1%}")
+        st.metric("3-Point %", f"{player['3P%']:.1%}")
     with col6:
-        st.metric("Free Throw %", f"{player_data['FT%'].values[0]:.1%}")
+        st.metric("Free Throw %", f"{player['FT%']:.1%}")
     
     # Display detailed statistics in an expander
     with st.expander("View Detailed Statistics"):
-        # Create a more detailed stats display
-        detailed_stats = {
-            'Games Played': player_data['G'].values[0],
-            'Minutes per Game': player_data['MP'].values[0],
-            'Field Goals per Game': player_data['FG'].values[0],
-            'Field Goal Attempts': player_data['FGA'].values[0],
-            '3-Pointers per Game': player_data['3P'].values[0],
-            '3-Point Attempts': player_data['3PA'].values[0],
-            'Free Throws per Game': player_data['FT'].values[0],
-            'Free Throw Attempts': player_data['FTA'].values[0],
-            'Offensive Rebounds': player_data['ORB'].values[0],
-            'Defensive Rebounds': player_data['DRB'].values[0],
-            'Steals per Game': player_data['STL'].values[0],
-            'Blocks per Game': player_data['BLK'].values[0],
-            'Turnovers': player_data['TOV'].values[0],
-            'Personal Fouls': player_data['PF'].values[0]
-        }
-        
-        # Convert to DataFrame for better display
-        detailed_df = pd.DataFrame([detailed_stats]).T
-        detailed_df.columns = ['Value']
-        st.dataframe(detailed_df, use_container_width=True)
-
-    # Create a radar chart for player attributes
-    fig = plt.figure(figsize=(8, 8))
-    categories = ['Scoring', 'Rebounding', 'Playmaking', 'Efficiency', 'Defense']
-    
-    # Calculate normalized values for each category
-    scoring = (player_data['PTS'].values[0]) / 30  # Normalize against 30 PPG
-    rebounding = (player_data['TRB'].values[0]) / 15  # Normalize against 15 RPG
-    playmaking = (player_data['AST'].values[0]) / 10  # Normalize against 10 APG
-    efficiency = player_data['FG%'].values[0]  # Already normalized
-    defense = ((player_data['STL'].values[0] + player_data['BLK'].values[0]) / 5)  # Normalize against 5 stocks
-    
-    values = [scoring, rebounding, playmaking, efficiency, defense]
-    values += values[:1]  # Repeat first value to close the polygon
-    
-    # Compute angle for each category
-    angles = [n / float(len(categories)) * 2 * np.pi for n in range(len(categories))]
-    angles += angles[:1]  # Repeat first angle to close the polygon
-    
-    # Create radar chart
-    ax = plt.subplot(111, polar=True)
-    plt.plot(angles, values)
-    plt.fill(angles, values, alpha=0.25)
-    
-    # Set the labels
-    plt.xticks(angles[:-1], categories)
-    
-    # Add title
-    plt.title("Player Attribute Radar")
-    
-    st.pyplot(fig)
+        st.dataframe(views.detailed_stats(player_name), width='stretch')
+
+    # Radar chart for player attributes, rendered once per distinct vector
+    st.image(render_radar(views.radar[player_name]), width='stretch')
 
 def main():
     st.set_page_config(page_title="NBA Player Stats Dashboard", layout="wide")
@@ -111,7 +162,7 @@ def main():
     st.markdown('<p class="big-font">NBA Player Statistics Dashboard</p>', unsafe_allow_html=True)
     
     # Load data
-    players_df = load_data()
+    signature, players_df = load_data()
     if players_df is None:
         return
     
@@ -119,28 +170,27 @@ def main():
     search_term = st.text_input("Search Player", "")
     
     # Filter players based on search term
-    if search_term:
-        filtered_players = players_df[players_df['Player'].str.contains(search_term, case=False, na=False)]
-    else:
-        filtered_players = players_df
+    search_index = load_search_index(signature)
+    player_names = search_index.search(search_term)
     
     # Create player dropdown
     selected_player = st.selectbox(
         "Select Player",
-        filtered_players['Player'].tolist(),
-        index=0 if not filtered_players.empty else None
+        player_names,
+        index=0 if player_names else None
     )
     
-    if selected_player:
+    views = load_player_views(signature)
+    if selected_player and selected_player in views:
         # Get player data
-        player_data = players_df[players_df['Player'] == selected_player]
+        player = views.row(selected_player)
         
         # Display player info header
-        st.markdown(f"### {selected_player} | {player_data['Pos'].values[0]} | {player_data['Tm'].values[0]}")
+        st.markdown(f"### {selected_player} | {player['Pos']} | {player['Tm']}")
         st.markdown("---")
         
         # Display player statistics
-        display_player_stats(player_data)
+        display_player_stats(views, selected_player)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
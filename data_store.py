@@ -0,0 +1,230 @@
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+
+from columnar_cache import load_table
+from elo import EloEngine
+from name_search import NameSearchIndex
+from player_filter import PlayerFilter
+from player_index import PlayerIndex
+from player_similarity import player_similarity, season_similarity
+from process_memory import frame_bytes
+from team_index import TeamIndex
+from trade_engine import TradeEngine
+
+PLAYERS_FILE = 'nba.csv'
+GAMES_FILE = 'nbaallelo.csv'
+FRANCHISE_FILE = 'frenchise.CSV'
+# Optional multi-season player pool for similarity search
+SEASONS_FILE = 'all_seasons.csv'
+
+
+def dataset_version(paths):
+    """Short identifier that changes whenever any of the data files change"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+        except OSError:
+            digest.update(f'{path}:missing;'.encode())
+    return digest.hexdigest()[:16]
+
+
+class Dataset:
+    """One loaded version of all three datasets plus every index derived from them
+
+    A snapshot is never modified after it is built; reloads build a new one
+    and swap it in, so a request that holds a snapshot always sees one version.
+    """
+
+    def __init__(self, version, players_df=None, teams_df=None, franchise_df=None, error=None, seasons_df=None):
+        self.version = version
+        self.players_df = players_df
+        self.teams_df = teams_df
+        self.franchise_df = franchise_df
+        self.seasons_df = seasons_df
+        self.error = error
+        self.loaded_at = time.time()
+        self.load_seconds = 0.0
+
+        self.player_index = PlayerIndex(players_df) if players_df is not None else None
+        self.name_search = NameSearchIndex(players_df['Player']) if players_df is not None else None
+        self.player_filter = PlayerFilter(players_df) if players_df is not None else None
+        self.trade_engine = TradeEngine(players_df) if players_df is not None else None
+        self.similarity = player_similarity(players_df) if players_df is not None else None
+        self.season_similarity = season_similarity(seasons_df)
+        self.team_index = TeamIndex(teams_df, franchise_df) if teams_df is not None else None
+        self.elo = EloEngine.from_game_log(teams_df) if teams_df is not None else None
+
+    @property
+    def loaded(self):
+        return self.error is None
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'loaded': self.loaded,
+            'error': self.error,
+            'loadedAt': self.loaded_at,
+            'loadSeconds': round(self.load_seconds, 4),
+            'players': len(self.players_df) if self.players_df is not None else 0,
+            'games': len(self.teams_df) if self.teams_df is not None else 0,
+            'frameBytes': {
+                'players': frame_bytes(self.players_df),
+                'games': frame_bytes(self.teams_df),
+                'franchises': frame_bytes(self.franchise_df),
+                'seasons': frame_bytes(self.seasons_df)
+            }
+        }
+
+
+def prepare_players(players_df):
+    players_df['Player'] = players_df['Player'].astype(str)
+    players_df['Pos'] = players_df['Pos'].astype(str)
+    players_df['Tm'] = players_df['Tm'].astype(str)
+    return players_df
+
+
+def prepare_games(teams_df):
+    teams_df['date_game'] = pd.to_datetime(teams_df['date_game'])
+    return teams_df[teams_df['lg_id'] == 'NBA']  # Filter for NBA games only
+
+
+def load_dataset(players_path=PLAYERS_FILE, games_path=GAMES_FILE, franchise_path=FRANCHISE_FILE, cache=True,
+                 seasons_path=SEASONS_FILE):
+    """Load the tables and build all indexes into a new Dataset
+
+    With `cache` each table is read from its typed binary cache, and the CSV
+    is only parsed again when its checksum changes. The seasons table is
+    optional and skipped when its file is absent.
+    """
+    start = time.perf_counter()
+    version = dataset_version([players_path, games_path, franchise_path, seasons_path])
+
+    # Load player data
+    players_df = load_table(players_path, prepare_players, cache=cache)
+
+    # Load team data
+    teams_df = load_table(games_path, prepare_games, cache=cache)
+
+    # Load franchise data
+    franchise_df = load_table(franchise_path, cache=cache)
+
+    # Load multi-season player data when present; it only feeds similarity search
+    seasons_df = None
+    if os.path.exists(seasons_path):
+        try:
+            seasons_df = load_table(seasons_path, cache=cache)
+        except Exception as e:
+            print(f"Error loading {seasons_path}: {str(e)}")
+
+    dataset = Dataset(version, players_df, teams_df, franchise_df, seasons_df=seasons_df)
+    dataset.load_seconds = time.perf_counter() - start
+    return dataset
+
+
+class DataStore:
+    """Holds the active Dataset and replaces it atomically on reload"""
+
+    def __init__(self, players_path=PLAYERS_FILE, games_path=GAMES_FILE, franchise_path=FRANCHISE_FILE, cache=True,
+                 seasons_path=SEASONS_FILE):
+        self.paths = (players_path, games_path, franchise_path)
+        self.seasons_path = seasons_path
+        self.cache = cache
+        self.reload_lock = threading.Lock()
+        self.listeners = []
+        self.watcher = None
+        self.failed_version = None
+        self.current = Dataset(None, error='Data not loaded')
+
+    def on_swap(self, callback):
+        """Register `callback(dataset)` to run after a new snapshot goes live"""
+        self.listeners.append(callback)
+
+    def source_version(self):
+        return dataset_version(self.paths + (self.seasons_path,))
+
+    def reload(self, force=False):
+        """Load the files into a new snapshot if they changed, then swap it in
+
+        Returns (dataset, swapped). A failed load keeps the previous snapshot
+        active unless nothing has loaded yet.
+        """
+        with self.reload_lock:
+            if not force and self.current.loaded and self.source_version() == self.current.version:
+                return self.current, False
+            try:
+                dataset = load_dataset(*self.paths, cache=self.cache, seasons_path=self.seasons_path)
+            except Exception as e:
+                print(f"Error loading data: {str(e)}")
+                self.failed_version = self.source_version()
+                if self.current.loaded:
+                    raise
+                dataset = Dataset(self.source_version(), error=str(e))
+
+            # A single reference assignment, so readers see the old or the new snapshot
+            self.current = dataset
+            for callback in self.listeners:
+                callback(dataset)
+            return dataset, True
+
+    def watch(self, interval=5.0):
+        """Poll the data files in a daemon thread and reload when they change"""
+        if self.watcher is not None:
+            return self.watcher
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                # Files that failed to load are retried only once they change again
+                if self.source_version() not in (self.current.version, self.failed_version):
+                    try:
+                        dataset, swapped = self.reload()
+                        if swapped:
+                            print(f"Reloaded data version {dataset.version} in {dataset.load_seconds:.2f}s")
+                    except Exception:
+                        pass
+
+        self.watcher = threading.Thread(target=poll, name='data-watcher', daemon=True)
+        self.watcher.start()
+        return self.watcher
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def shared_store(cache=True):
+    """The process-wide DataStore, loaded on first use
+
+    api.py and app.py both read players through this store, so one process
+    serving both apps holds a single copy of the data and its indexes.
+    """
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            store = DataStore(cache=cache)
+            store.reload(force=True)
+            _shared_store = store
+        return _shared_store
+
+
+def _after_fork_in_child():
+    # Pool workers are forked while request and watcher threads run. A lock one of
+    # them held at that moment would stay held forever in the child, so the locks
+    # worker tasks take are replaced with fresh ones
+    global _shared_lock
+    _shared_lock = threading.Lock()
+    if _shared_store is not None:
+        _shared_store.reload_lock = threading.Lock()
+        player_filter = _shared_store.current.player_filter
+        if player_filter is not None:
+            player_filter.orders_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+# FiveThirtyEight NBA Elo parameters
+K_FACTOR = 20
+HOME_ADVANTAGE = 100
+MEAN_RATING = 1505
+NEW_TEAM_RATING = 1300
+SEASON_CARRYOVER = 0.75
+
+
+def to_ns(date):
+    """Nanosecond timestamp for a date string, datetime or Timestamp"""
+    return pd.Timestamp(date).as_unit('ns').value
+
+
+def season_of(dates):
+    # NBA seasons are named for the year they end in and start in the autumn
+    dates = pd.DatetimeIndex(dates)
+    return dates.year + (dates.month >= 8)
+
+
+def win_probability(rating, opp_rating):
+    return 1.0 / (1.0 + 10 ** ((opp_rating - rating) / 400.0))
+
+
+def rating_shift(rating, opp_rating, pts, opp_pts, k=K_FACTOR):
+    """Elo change for `rating`'s side, with the margin-of-victory multiplier"""
+    margin = np.abs(pts - opp_pts)
+    result = np.where(pts > opp_pts, 1.0, np.where(pts < opp_pts, 0.0, 0.5))
+    winner_diff = np.where(pts >= opp_pts, rating - opp_rating, opp_rating - rating)
+    multiplier = (margin + 3) ** 0.8 / (7.5 + 0.006 * winner_diff)
+    return k * multiplier * (result - win_probability(rating, opp_rating))
+
+
+class EloEngine:
+    """Per-team Elo time series in sorted arrays, queried by binary search"""
+
+    def __init__(self):
+        self.dates = {}
+        self.ratings = {}
+        self.seasons = {}
+
+    @classmethod
+    def from_game_log(cls, games):
+        """Build from a game log, reusing its `elo_n` ratings where present
+
+        Rows without `elo_n` that are newer than both teams' last rated game,
+        such as games appended to the file after its ratings were computed,
+        are rated incrementally with `append`. Unrated rows inside the rated
+        history are left out.
+        """
+        engine = cls()
+        if 'elo_n' not in games.columns:
+            engine.append(games)
+            return engine
+
+        rated = games['elo_n'].notna().to_numpy()
+        pending = games[~rated]
+        games = games[rated]
+        codes, team_ids = pd.factorize(games['team_id'])
+        dates = games['date_game'].values.astype('datetime64[ns]').astype('int64')
+        ratings = games['elo_n'].to_numpy(dtype='float64')
+        seasons = season_of(games['date_game']).to_numpy()
+        order = np.lexsort((dates, codes))
+        bounds = np.cumsum(np.bincount(codes, minlength=len(team_ids)))[:-1]
+        for team_id, rows in zip(team_ids, np.split(order, bounds)):
+            engine.dates[team_id] = dates[rows]
+            engine.ratings[team_id] = ratings[rows]
+            engine.seasons[team_id] = int(seasons[rows[-1]])
+
+        if len(pending):
+            last = {team_id: team_dates[-1] for team_id, team_dates in engine.dates.items()}
+            pending_dates = pending['date_game'].values.astype('datetime64[ns]').astype('int64')
+            floor = np.iinfo('int64').min
+            newer = ((pending_dates > pending['team_id'].astype(str).map(last).fillna(floor).to_numpy())
+                     & (pending_dates > pending['opp_id'].astype(str).map(last).fillna(floor).to_numpy()))
+            engine.append(pending[newer])
+        return engine
+
+    def current(self, team_id):
+        ratings = self.ratings.get(team_id)
+        return float(ratings[-1]) if ratings is not None and len(ratings) else None
+
+    def append(self, games):
+        """Rate new games from each team's current rating and extend the series
+
+        `games` needs date_game, team_id, opp_id, pts, opp_pts and optionally
+        game_location; the game log's mirrored `_iscopy` rows are skipped.
+        Games are processed one game day at a time: a team plays at most once
+        a day, so every game on a day is rated in one vectorized step.
+        """
+        if '_iscopy' in games.columns:
+            games = games[games['_iscopy'] == 0]
+        games = games.sort_values('date_game', kind='stable')
+        dates = games['date_game'].values.astype('datetime64[ns]').astype('int64')
+        seasons = season_of(games['date_game']).to_numpy()
+        home = games['team_id'].astype(str).to_numpy()
+        away = games['opp_id'].astype(str).to_numpy()
+        home_pts = games['pts'].to_numpy(dtype='float64')
+        away_pts = games['opp_pts'].to_numpy(dtype='float64')
+        if 'game_location' in games.columns:
+            location = games['game_location'].astype(str).to_numpy()
+            advantage = np.where(location == 'H', HOME_ADVANTAGE, np.where(location == 'A', -HOME_ADVANTAGE, 0))
+        else:
+            advantage = np.zeros(len(games))
+
+        # Current rating and season per team in dense arrays for the batch updates
+        team_ids = sorted(set(self.ratings) | set(home) | set(away))
+        code_of = {team_id: code for code, team_id in enumerate(team_ids)}
+        rating = np.array([self.current(team_id) or NEW_TEAM_RATING for team_id in team_ids], dtype='float64')
+        season = np.array([self.seasons.get(team_id, 0) for team_id in team_ids])
+        home_codes = np.array([code_of[team_id] for team_id in home], dtype='int64')
+        away_codes = np.array([code_of[team_id] for team_id in away], dtype='int64')
+
+        # Series stay sorted only if every game is newer than the teams' last rated game
+        last = np.array([self.dates[team_id][-1] if team_id in self.dates else np.iinfo('int64').min
+                         for team_id in team_ids], dtype='int64')
+        if len(dates) and ((dates <= last[home_codes]) | (dates <= last[away_codes])).any():
+            raise ValueError('Appended games must be newer than each team\'s last rated game')
+
+        new_dates = {team_id: [] for team_id in team_ids}
+        new_ratings = {team_id: [] for team_id in team_ids}
+        day_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(dates) else []
+        for start, stop in zip(day_starts, list(day_starts[1:]) + [len(dates)]):
+            batch = np.arange(start, stop)
+            teams = np.concatenate((home_codes[batch], away_codes[batch]))
+            if len(np.unique(teams)) < len(teams):
+                # A team listed twice on one day: fall back to one game at a time
+                batches = [batch[i:i + 1] for i in range(len(batch))]
+            else:
+                batches = [batch]
+            for games_now in batches:
+                h, a = home_codes[games_now], away_codes[games_now]
+                # Regress ratings toward the mean at each team's first game of a season
+                for codes in (h, a):
+                    new_season = season[codes] != seasons[games_now]
+                    revert = new_season & (season[codes] != 0)
+                    rating[codes[revert]] = (SEASON_CARRYOVER * rating[codes[revert]]
+                                             + (1 - SEASON_CARRYOVER) * MEAN_RATING)
+                    season[codes] = seasons[games_now]
+                shift = rating_shift(rating[h] + advantage[games_now], rating[a],
+                                     home_pts[games_now], away_pts[games_now])
+                rating[h] += shift
+                rating[a] -= shift
+                for i, game in enumerate(games_now):
+                    new_dates[team_ids[h[i]]].append(dates[game])
+                    new_ratings[team_ids[h[i]]].append(rating[h[i]])
+                    new_dates[team_ids[a[i]]].append(dates[game])
+                    new_ratings[team_ids[a[i]]].append(rating[a[i]])
+
+        for code, team_id in enumerate(team_ids):
+            if not new_dates[team_id]:
+                continue
+            self.dates[team_id] = np.concatenate((self.dates.get(team_id, np.empty(0, 'int64')),
+                                                  np.array(new_dates[team_id], dtype='int64')))
+            self.ratings[team_id] = np.concatenate((self.ratings.get(team_id, np.empty(0)),
+                                                    np.array(new_ratings[team_id], dtype='float64')))
+            self.seasons[team_id] = int(season[code])
+
+    def rating_on(self, team_id, date):
+        """Return (date of the last game on or before `date`, rating after it), or None"""
+        dates = self.dates.get(team_id)
+        if dates is None:
+            raise KeyError(team_id)
+        i = np.searchsorted(dates, to_ns(date), side='right') - 1
+        if i < 0:
+            return None
+        return dates[i], float(self.ratings[team_id][i])
+
+    def trajectory(self, team_id, start=None, end=None):
+        """Return the (dates, ratings) arrays for games between `start` and `end` inclusive"""
+        dates = self.dates.get(team_id)
+        if dates is None:
+            raise KeyError(team_id)
+        lo = np.searchsorted(dates, to_ns(start), side='left') if start is not None else 0
+        hi = np.searchsorted(dates, to_ns(end), side='right') if end is not None else len(dates)
+        return dates[lo:hi], self.ratings[team_id][lo:hi]
+
+    def snapshot(self, date):
+        """Return every team's latest rating as of `date`, highest first"""
+        ratings = []
+        for team_id in self.dates:
+            found = self.rating_on(team_id, date)
+            if found is not None:
+                ratings.append((team_id, found[0], found[1]))
+        return sorted(ratings, key=lambda item: -item[2])
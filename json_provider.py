@@ -0,0 +1,95 @@
+import datetime
+import json
+import math
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response layouts for bulk endpoints: a list of row objects, or one array per field
+FORMATS = ('records', 'columns')
+
+
+def _default(value):
+    """Convert the NumPy and pandas values orjson does not handle natively"""
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else str(value.astype('datetime64[s]'))
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, pd.Series, pd.Index, pd.api.extensions.ExtensionArray)):
+        if isinstance(value, np.ndarray) and value.dtype.kind == 'M':
+            return [None if np.isnat(item) else str(item) for item in value.astype('datetime64[s]')]
+        return [None if item is pd.NaT or item is pd.NA else item for item in value.tolist()]
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _clean(value):
+    # The standard library writes NaN literally, so replace it before encoding
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    if isinstance(value, (np.generic, np.ndarray, pd.Series, pd.Index, pd.api.extensions.ExtensionArray)):
+        return _clean(_default(value))
+    return value
+
+
+def dumps(obj, sort_keys=False, indent=False):
+    """Serialize to UTF-8 JSON bytes; NaN and infinities become null, dates ISO 8601"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(_clean(obj), default=_default, allow_nan=False, sort_keys=sort_keys,
+                      indent=2 if indent else None, separators=None if indent else (',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def response_format(args):
+    """The `format` query argument, 'records' unless 'columns' is requested"""
+    value = args.get('format', 'records') or 'records'
+    if value not in FORMATS:
+        raise ValueError(f'Unknown format: {value}')
+    return value
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with a standard library fallback
+
+    NumPy scalars and arrays, datetime64 and pandas timestamps serialize
+    directly, so views can return them without converting values one by one.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = dumps(obj, sort_keys=self.sort_keys, indent=indent)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install(app):
+    """Route every jsonify call and JSON response of `app` through FastJSONProvider"""
+    app.json = FastJSONProvider(app)
+    return app.json
@@ -0,0 +1,199 @@
+import json
+import logging
+import threading
+import time
+
+from flask import Response, g, request
+
+# Request duration histogram bounds in seconds
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Where a request's time goes: the view's own work, JSON encoding, sending the body, and all of it
+PHASES = ('data', 'serialize', 'response', 'total')
+
+request_log = logging.getLogger('nba.requests')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{_labels(self.label_names, label_values)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            for label_values, (counts, total, count) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _labels(self.label_names + ('le',), label_values + (repr(bound),))
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _labels(self.label_names + ('le',), label_values + ('+Inf',))
+                lines.append(f'{self.name}_bucket{labels} {count}')
+                lines.append(f'{self.name}_sum{_labels(self.label_names, label_values)} {total}')
+                lines.append(f'{self.name}_count{_labels(self.label_names, label_values)} {count}')
+        return lines
+
+
+class RequestMetrics:
+    """Per-request phase timing for a Flask app, exposed in Prometheus text format
+
+    Each request is split into the view's data work, JSON serialization
+    (timed inside the app's JSON provider) and sending the response body.
+    Timings are returned in a Server-Timing header, optionally logged as one
+    JSON line per request, and aggregated into counters and histograms at
+    /metrics.
+    """
+
+    def __init__(self, app, log_requests=False):
+        self.app = app
+        self.log_requests = log_requests
+        self.requests = Counter('http_requests_total', 'Requests handled', ('endpoint', 'method', 'status'))
+        self.durations = Histogram('http_request_duration_seconds', 'Request latency by phase',
+                                   ('endpoint', 'phase'))
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.collectors = []
+
+        if log_requests:
+            request_log.setLevel(logging.INFO)
+            if not request_log.hasHandlers():
+                # One bare JSON object per line on stderr unless logging is configured elsewhere
+                handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                request_log.addHandler(handler)
+                # waitress configures the root logger later, which would print every line twice
+                request_log.propagate = False
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        self._time_serialization(app.json)
+        app.add_url_rule('/metrics', 'metrics', self.render_response)
+
+    def add_collector(self, collect):
+        """Register `collect()` returning extra exposition lines, e.g. cache or pool gauges"""
+        self.collectors.append(collect)
+
+    def _time_serialization(self, provider):
+        original = provider.response
+
+        def timed_response(*args, **kwargs):
+            start = time.perf_counter()
+            response = original(*args, **kwargs)
+            if 'request_timing' in g:
+                g.request_timing['serialize'] += time.perf_counter() - start
+            return response
+
+        provider.response = timed_response
+
+    def _start(self):
+        g.request_timing = {'start': time.perf_counter(), 'serialize': 0.0}
+        with self.lock:
+            self.in_flight += 1
+
+    def _finish(self, response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+        with self.lock:
+            self.in_flight -= 1
+
+        handled = time.perf_counter()
+        view_seconds = handled - timing['start']
+        serialize = min(timing['serialize'], view_seconds)
+        data = view_seconds - serialize
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        method = request.method
+        status = response.status_code
+
+        self.requests.inc(endpoint, method, status)
+        self.durations.observe(data, endpoint, 'data')
+        self.durations.observe(serialize, endpoint, 'serialize')
+        response.headers['Server-Timing'] = f'data;dur={data * 1000:.3f}, serialize;dur={serialize * 1000:.3f}'
+
+        def closed():
+            # Runs once the server has written the body
+            finished = time.perf_counter()
+            self.durations.observe(finished - handled, endpoint, 'response')
+            self.durations.observe(finished - timing['start'], endpoint, 'total')
+            if self.log_requests:
+                request_log.info(json.dumps({
+                    'method': method,
+                    'endpoint': endpoint,
+                    'status': status,
+                    'dataMs': round(data * 1000, 3),
+                    'serializeMs': round(serialize * 1000, 3),
+                    'responseMs': round((finished - handled) * 1000, 3),
+                    'totalMs': round((finished - timing['start']) * 1000, 3)
+                }))
+
+        response.call_on_close(closed)
+        return response
+
+    def render(self):
+        lines = self.requests.render() + self.durations.render()
+        lines += ['# HELP http_requests_in_flight Requests being handled',
+                  '# TYPE http_requests_in_flight gauge',
+                  f'http_requests_in_flight {self.in_flight}']
+        for collect in self.collectors:
+            lines += collect()
+        return '\n'.join(lines) + '\n'
+
+    def render_response(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def gauges(prefix, values, help_text):
+    """Exposition lines for a flat dict of numeric stats, one gauge per key"""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f'{prefix}_' + ''.join('_' + ch.lower() if ch.isupper() else ch for ch in key)
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {value}']
+    return lines
@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+import numpy as np
+
+GRAM_SIZE = 3
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+def grams(text, max_size=GRAM_SIZE):
+    """All distinct substrings of `text` up to `max_size` characters"""
+    return {text[i:i + size] for size in range(1, max_size + 1) for i in range(len(text) - size + 1)}
+
+
+class NameSearchIndex:
+    """N-gram inverted index over lowercased player names for substring search"""
+
+    def __init__(self, names):
+        self.names = [str(name) for name in names]
+        self.keys = [name.lower() for name in self.names]
+
+        postings = defaultdict(list)
+        for position, key in enumerate(self.keys):
+            for gram in grams(key):
+                postings[gram].append(position)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _candidates(self, term):
+        # Short terms are indexed directly; longer ones intersect their trigram postings
+        if len(term) <= GRAM_SIZE:
+            return self.postings.get(term, EMPTY), False
+        lists = sorted((self.postings.get(term[i:i + GRAM_SIZE], EMPTY)
+                        for i in range(len(term) - GRAM_SIZE + 1)), key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return candidates, True
+
+    def _rank(self, position, term):
+        key = self.keys[position]
+        if key.startswith(term):
+            score = 0
+        elif f' {term}' in key:
+            score = 1
+        else:
+            score = 2
+        return score, len(key), position
+
+    def search(self, term, limit=None, rank=False):
+        """Return names containing `term` (case-insensitive) in row order, or ranked
+
+        Ranked results put full-name prefix matches first, then word prefix
+        matches, then any other substring match, shorter names first.
+        """
+        term = term.lower()
+        if limit == 0:
+            return []
+        if not term:
+            return self.names[:limit] if limit is not None else list(self.names)
+
+        candidates, verify = self._candidates(term)
+        keys = self.keys
+        matches = []
+        for position in candidates.tolist():
+            if verify and term not in keys[position]:
+                continue
+            matches.append(position)
+            if not rank and limit is not None and len(matches) >= limit:
+                break
+
+        if rank:
+            matches.sort(key=lambda position: self._rank(position, term))
+            if limit is not None:
+                matches = matches[:limit]
+        return [self.names[position] for position in matches]
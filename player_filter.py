@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from json_provider import response_format
+
+# Response field -> (source column, scale); scale None keeps the raw value, int casts
+RESULT_FIELDS = {
+    'name': ('Player', None),
+    'position': ('Pos', None),
+    'team': ('Tm', None),
+    'points': ('PTS', 1),
+    'rebounds': ('TRB', 1),
+    'assists': ('AST', 1),
+    'gamesPlayed': ('G', int),
+    'minutesPerGame': ('MP', 1),
+    'fieldGoalPercentage': ('FG%', 100),
+    'threePointPercentage': ('3P%', 100)
+}
+DEFAULT_SORT = '-points'
+# Largest page a search returns; X-Total-Count still reports every match
+MAX_LIMIT = 1000
+# Distinct sort orders kept per filter; each is one int64 array per player row
+SORT_CACHE_SIZE = 32
+
+
+def _result_column(series, scale):
+    # Views onto the frame's own arrays where possible, so the filter adds no copy
+    if scale is None:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.array
+        return series.to_numpy(dtype=object)
+    if scale is int:
+        if series.isna().any():
+            return series.astype('Int64').to_numpy(dtype=object, na_value=None)
+        return series.to_numpy()
+    if scale == 1:
+        return series.to_numpy(dtype='float64')
+    return series.to_numpy(dtype='float64') * scale
+
+
+def _float_arg(args, name):
+    try:
+        return float(args.get(name, 0))
+    except (ValueError, TypeError):
+        return 0
+
+
+def parse_fields(value):
+    """Response fields from a comma-separated `fields` argument, or None for all"""
+    fields = [field.strip() for field in (value or '').split(',') if field.strip()]
+    if not fields:
+        return None
+    unknown = [field for field in fields if field not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown field: {", ".join(unknown)}')
+    return fields
+
+
+def search_arguments(args, max_limit=MAX_LIMIT):
+    """Keyword arguments for PlayerFilter.search from request query parameters
+
+    Unparseable numbers fall back to their defaults; an unknown field raises ValueError.
+    """
+    try:
+        offset = max(int(args.get('offset', 0)), 0)
+    except (ValueError, TypeError):
+        offset = 0
+
+    try:
+        limit = min(max(int(args['limit']), 0), max_limit)
+    except (KeyError, ValueError, TypeError):
+        limit = max_limit
+
+    return {
+        'min_points': _float_arg(args, 'min_points'),
+        'min_rebounds': _float_arg(args, 'min_rebounds'),
+        'min_assists': _float_arg(args, 'min_assists'),
+        'position': args.get('position', '').upper(),
+        'team': args.get('team', '').upper(),
+        'sort': args.get('sort', DEFAULT_SORT),
+        'offset': offset,
+        'limit': limit,
+        'fields': parse_fields(args.get('fields')),
+        'orient': response_format(args)
+    }
+
+
+class PlayerFilter:
+    """Columnar multi-criteria player filter with precomputed sort orders"""
+
+    def __init__(self, players_df):
+        players_df = players_df.reset_index(drop=True)
+        self.size = len(players_df)
+        self.frame = players_df
+        self.points = players_df['PTS'].to_numpy(dtype='float64')
+        self.rebounds = players_df['TRB'].to_numpy(dtype='float64')
+        self.assists = players_df['AST'].to_numpy(dtype='float64')
+
+        # Few distinct positions and teams, so match tokens against uniques and map back by code
+        self.pos_codes, pos_values = pd.factorize(players_df['Pos'].astype(str).str.upper())
+        self.pos_values = list(pos_values)
+        self.team_codes, team_values = pd.factorize(players_df['Tm'].astype(str))
+        self.team_lookup = {team: code for code, team in enumerate(team_values)}
+
+        self.columns = {field: _result_column(players_df[column], scale)
+                        for field, (column, scale) in RESULT_FIELDS.items()}
+        self.orders = OrderedDict()
+        self.orders_lock = threading.Lock()
+        self.sort_order(DEFAULT_SORT)
+
+    def _parse_sort(self, sort):
+        """Canonical ((column, descending), ...) for a sort string; repeated columns keep their first use"""
+        keys = []
+        seen = set()
+        for key in sort.split(','):
+            key = key.strip()
+            if not key:
+                continue
+            descending = key.startswith('-')
+            name = key[1:] if key[:1] in '-+' else key
+            if name in RESULT_FIELDS:
+                name = RESULT_FIELDS[name][0]
+            if name not in self.frame.columns:
+                raise ValueError(f'Unknown sort key: {key}')
+            if name not in seen:
+                seen.add(name)
+                keys.append((name, descending))
+        return tuple(keys) or self._parse_sort(DEFAULT_SORT)
+
+    def _sort_key(self, name, descending):
+        column = self.frame[name]
+        if pd.api.types.is_numeric_dtype(column):
+            values = column.to_numpy(dtype='float64')
+        else:
+            # Rank strings so every key sorts numerically; missing values stay last
+            codes, _ = pd.factorize(column, sort=True)
+            values = np.where(codes < 0, np.nan, codes).astype('float64')
+        return -values if descending else values
+
+    def sort_order(self, sort):
+        """Return row positions ordered by comma-separated keys, '-' for descending"""
+        keys = self._parse_sort(sort)
+        with self.orders_lock:
+            order = self.orders.get(keys)
+            if order is not None:
+                self.orders.move_to_end(keys)
+                return order
+        # np.lexsort treats its last key as primary; it is stable and puts NaN last
+        order = np.lexsort([self._sort_key(name, descending) for name, descending in reversed(keys)])
+        with self.orders_lock:
+            self.orders[keys] = order
+            if len(self.orders) > SORT_CACHE_SIZE:
+                self.orders.popitem(last=False)
+        return order
+
+    def mask(self, min_points=0, min_rebounds=0, min_assists=0, position='', team=''):
+        """Combine all criteria into one boolean mask, or None when nothing filters"""
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if min_points > 0:
+            mask = combine(mask, self.points >= min_points)
+        if min_rebounds > 0:
+            mask = combine(mask, self.rebounds >= min_rebounds)
+        if min_assists > 0:
+            mask = combine(mask, self.assists >= min_assists)
+        if position:
+            token = position.upper()
+            matching = [code for code, value in enumerate(self.pos_values) if token in value]
+            mask = combine(mask, np.isin(self.pos_codes, matching))
+        if team:
+            code = self.team_lookup.get(team, -1)
+            mask = combine(mask, self.team_codes == code)
+        return mask
+
+    def search(self, sort=DEFAULT_SORT, offset=0, limit=None, fields=None, orient='records', **criteria):
+        """Return (total matches, the requested page as records or as columns)"""
+        order = self.sort_order(sort)
+        mask = self.mask(**criteria)
+        rows = order if mask is None else order[mask[order]]
+        stop = None if limit is None else offset + limit
+        if orient == 'columns':
+            return len(rows), self.column_arrays(rows[offset:stop], fields)
+        return len(rows), self.records(rows[offset:stop], fields)
+
+    def column_arrays(self, rows, fields=None):
+        """The given row positions as one array per field, serialized without per-value conversion"""
+        fields = list(RESULT_FIELDS) if fields is None else fields
+        return {field: self.columns[field][rows] for field in fields}
+
+    def records(self, rows, fields=None):
+        """Serialize the given row positions column by column"""
+        fields = list(RESULT_FIELDS) if fields is None else fields
+        columns = [self.columns[field][rows].tolist() for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
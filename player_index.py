@@ -0,0 +1,93 @@
+import unicodedata
+
+from json_provider import dumps
+
+
+def normalize_name(name):
+    """Case- and diacritic-insensitive form of a player name"""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def build_player_stats(row):
+    """Build the /api/player/<name> response dict from one player row"""
+    return {
+        'name': row['Player'],
+        'position': row['Pos'],
+        'team': row['Tm'],
+        'basicStats': {
+            'pointsPerGame': float(row['PTS']),
+            'reboundsPerGame': float(row['TRB']),
+            'assistsPerGame': float(row['AST']),
+            'fieldGoalPercentage': float(row['FG%'] * 100),
+            'threePointPercentage': float(row['3P%'] * 100),
+            'freeThrowPercentage': float(row['FT%'] * 100)
+        },
+        'detailedStats': {
+            'gamesPlayed': int(row['G']),
+            'minutesPerGame': float(row['MP']),
+            'fieldGoalsPerGame': float(row['FG']),
+            'fieldGoalAttempts': float(row['FGA']),
+            'threePointersPerGame': float(row['3P']),
+            'threePointAttempts': float(row['3PA']),
+            'freeThrowsPerGame': float(row['FT']),
+            'freeThrowAttempts': float(row['FTA']),
+            'offensiveRebounds': float(row['ORB']),
+            'defensiveRebounds': float(row['DRB']),
+            'stealsPerGame': float(row['STL']),
+            'blocksPerGame': float(row['BLK']),
+            'turnovers': float(row['TOV']),
+            'personalFouls': float(row['PF'])
+        },
+        'radarStats': {
+            'scoring': min(float(row['PTS']) / 30, 1),
+            'rebounding': min(float(row['TRB']) / 15, 1),
+            'playmaking': min(float(row['AST']) / 10, 1),
+            'efficiency': float(row['FG%']),
+            'defense': min((float(row['STL']) + float(row['BLK'])) / 5, 1)
+        }
+    }
+
+
+class PlayerIndex:
+    """Hash index from player name to row, with each player's response pre-serialized"""
+
+    def __init__(self, players_df):
+        self.positions = {}
+        self.normalized = {}
+        self.payloads = {}
+        self.errors = {}
+
+        records = players_df.to_dict('records')
+        for position, row in enumerate(records):
+            name = row['Player']
+            # Players traded mid-season have several rows; the first one wins
+            if name in self.positions:
+                continue
+            self.positions[name] = position
+            self.normalized.setdefault(normalize_name(name), name)
+            try:
+                self.payloads[name] = dumps(build_player_stats(row))
+            except (TypeError, ValueError) as e:
+                self.errors[name] = str(e)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def resolve(self, name, normalized=False):
+        """Return the canonical player name for `name`, or None"""
+        if name in self.positions:
+            return name
+        if normalized:
+            return self.normalized.get(normalize_name(name))
+        return None
+
+    def payload(self, name):
+        """Return the serialized stats for a canonical player name"""
+        if name in self.errors:
+            raise ValueError(self.errors[name])
+        return self.payloads[name]
@@ -0,0 +1,139 @@
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Per-game stats compared for players in nba.csv
+PLAYER_FEATURES = ['PTS', 'TRB', 'ORB', 'DRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'MP',
+                   'FGA', 'FG%', '3PA', '3P%', 'FTA', 'FT%']
+# Per-season stats compared for players in all_seasons.csv
+SEASON_FEATURES = ['pts', 'reb', 'ast', 'net_rating', 'oreb_pct', 'dreb_pct', 'usg_pct', 'ts_pct', 'ast_pct']
+METRICS = ('cosine', 'euclidean')
+# Pools at least this large get a KD-tree when scipy is installed
+TREE_MIN_ROWS = 20_000
+
+
+def standardize(values):
+    """Z-scores per column as float32; missing values become the column mean (0)"""
+    with np.errstate(invalid='ignore'):
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+    mean = np.nan_to_num(mean)
+    std = np.where(np.isnan(std) | (std == 0), 1.0, std)
+    return np.nan_to_num((values - mean) / std).astype('float32')
+
+
+class SimilarityIndex:
+    """Nearest neighbours over a standardized float32 stat matrix
+
+    Brute-force scoring is one matrix-vector product. With `use_tree` (or
+    automatically for large pools) queries go through KD-trees instead:
+    one over the vectors for Euclidean distance and one over unit vectors,
+    where Euclidean order equals cosine order, for cosine similarity.
+    """
+
+    def __init__(self, values, labels, details, use_tree=None):
+        self.matrix = standardize(np.asarray(values, dtype='float64'))
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        self.unit = self.matrix / np.where(norms == 0, 1, norms)
+        self.labels = np.asarray(labels, dtype=object)
+        self.details = details
+
+        if use_tree is None:
+            use_tree = len(self.matrix) >= TREE_MIN_ROWS
+        self.trees = None
+        if use_tree and cKDTree is not None and len(self.matrix):
+            self.trees = {'euclidean': cKDTree(self.matrix), 'cosine': cKDTree(self.unit)}
+
+        # Rows per label, in file order
+        self.rows = {}
+        for row, label in enumerate(self.labels):
+            self.rows.setdefault(label, []).append(row)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def row_for(self, label, season=None):
+        """The query row for a label: its first row, or for season pools the given or latest season"""
+        rows = self.rows.get(label)
+        if not rows:
+            return None
+        if 'season' not in self.details:
+            return rows[0]
+        seasons = self.details['season']
+        if season is None:
+            return max(rows, key=lambda row: seasons[row])
+        return next((row for row in rows if seasons[row] == season), None)
+
+    def _brute_force(self, row, k, metric, excluded):
+        if metric == 'cosine':
+            scores = self.unit @ self.unit[row]
+            order_key = -scores
+        else:
+            scores = np.sqrt(((self.matrix - self.matrix[row]) ** 2).sum(axis=1))
+            order_key = scores
+        order_key = order_key.copy()
+        order_key[excluded] = np.inf
+        available = len(order_key) - len(excluded)
+        k = min(k, available)
+        if k <= 0:
+            return []
+        top = np.argpartition(order_key, k - 1)[:k]
+        top = top[np.argsort(order_key[top], kind='stable')]
+        return list(zip(top.tolist(), scores[top].tolist()))
+
+    def _tree(self, row, k, metric, excluded):
+        tree = self.trees[metric]
+        point = self.unit[row] if metric == 'cosine' else self.matrix[row]
+        excluded = set(excluded)
+        fetch = min(k + len(excluded), len(self.matrix))
+        distances, rows = tree.query(point, k=fetch)
+        found = []
+        for distance, neighbour in zip(np.atleast_1d(distances), np.atleast_1d(rows)):
+            if int(neighbour) in excluded:
+                continue
+            # |a - b|^2 = 2 - 2 cos(a, b) for unit vectors
+            score = 1 - float(distance) ** 2 / 2 if metric == 'cosine' else float(distance)
+            found.append((int(neighbour), score))
+            if len(found) == k:
+                break
+        return found
+
+    def neighbors(self, row, k=10, metric='cosine', exclude_same_label=True):
+        """Return [(row, score)] for the `k` nearest rows; cosine similarity or Euclidean distance"""
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric: {metric}')
+        excluded = self.rows[self.labels[row]] if exclude_same_label else [row]
+        if self.trees is not None:
+            return self._tree(row, k, metric, excluded)
+        return self._brute_force(row, k, metric, excluded)
+
+    def describe(self, row):
+        return {name: values[row] for name, values in self.details.items()}
+
+
+def player_similarity(players_df, use_tree=None):
+    """Index over nba.csv rows, labelled by player name"""
+    details = {
+        'name': players_df['Player'].astype(str).tolist(),
+        'team': players_df['Tm'].astype(str).tolist(),
+        'position': players_df['Pos'].astype(str).tolist()
+    }
+    return SimilarityIndex(players_df[PLAYER_FEATURES].to_numpy(dtype='float64'),
+                           details['name'], details, use_tree)
+
+
+def season_similarity(seasons_df, use_tree=None):
+    """Index over all_seasons.csv rows, or None when the file lacks the expected columns"""
+    required = SEASON_FEATURES + ['player_name', 'team_abbreviation', 'season']
+    if seasons_df is None or any(column not in seasons_df.columns for column in required):
+        return None
+    details = {
+        'name': seasons_df['player_name'].astype(str).tolist(),
+        'team': seasons_df['team_abbreviation'].astype(str).tolist(),
+        'season': seasons_df['season'].astype(str).tolist()
+    }
+    return SimilarityIndex(seasons_df[SEASON_FEATURES].to_numpy(dtype='float64'),
+                           details['name'], details, use_tree)
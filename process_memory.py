@@ -0,0 +1,44 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    # Windows has neither /proc nor resource; usage is reported without an RSS
+    resource = None
+
+
+def memory_usage():
+    """Resident memory of this process in bytes, split into shared and private pages
+
+    Shared pages include memory-mapped cache files that other workers map
+    too. On platforms without /proc only the peak RSS is available, and
+    without the resource module (Windows) rss is None.
+    """
+    usage = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+        usage['rss'] = fields['Rss']
+        usage['pss'] = fields.get('Pss', 0)
+        usage['shared'] = fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+        usage['private'] = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+        return usage
+    except (OSError, KeyError):
+        pass
+    if resource is None:
+        usage['rss'] = None
+        return usage
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    usage['rss'] = peak if sys.platform == 'darwin' else peak * 1024
+    return usage
+
+
+def frame_bytes(df):
+    """Bytes held by a DataFrame's columns, counting string contents"""
+    return int(df.memory_usage(index=True, deep=True).sum()) if df is not None else 0
@@ -0,0 +1,84 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_INTERVAL = 0.005
+
+
+class SamplingProfiler:
+    """Samples every other thread's Python stack at a fixed interval
+
+    Samples are aggregated as collapsed stacks ("outer;inner;leaf count"),
+    the input format of flamegraph.pl and speedscope. Sampling only reads
+    frames, so the profiled code runs unmodified; the cost is one stack walk
+    per thread per interval.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, ignore_threads=()):
+        self.interval = interval
+        self.ignore_threads = set(ignore_threads)
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = threading.Event()
+        self.thread = None
+
+    def _sample(self):
+        ignored = self.ignore_threads | {threading.get_ident()}
+        while self.running.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in ignored:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        if self.thread is None:
+            self.running.set()
+            self.thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.running.clear()
+            self.thread.join()
+            self.thread = None
+        return self
+
+    def collapsed(self, exclude_idle=True):
+        """Collapsed stacks, most frequent first; idle server threads are left out by default"""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            if exclude_idle and _idle(stack):
+                continue
+            lines.append(f'{stack} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# Modules whose frames at the top of a stack mean the thread is blocked waiting for work or a socket
+IDLE_MODULES = ('(threading.py:', '(queue.py:', '(selectors.py:', '(socket.py:', '(socketserver.py:')
+
+
+def _idle(stack):
+    leaf = stack.rsplit(';', 1)[-1]
+    return leaf.startswith(IDLE_MODULES, leaf.find(' ') + 1)
+
+
+def profile_for(seconds, interval=DEFAULT_INTERVAL):
+    """Sample every other thread for `seconds` and return the collapsed stacks"""
+    with SamplingProfiler(interval, ignore_threads=[threading.get_ident()]) as profiler:
+        time.sleep(seconds)
+    return profiler.collapsed()
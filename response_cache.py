@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+
+# Headers worth replaying from a cached response; CORS headers are added per request
+CACHED_HEADERS = ('Content-Type', 'X-Total-Count')
+
+
+def request_key():
+    """Endpoint path plus sorted, non-empty query args"""
+    args = tuple(sorted((key, value) for key, value in request.args.items(multi=True) if value != ''))
+    return request.path, args
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of successful GET responses with size and TTL bounds"""
+
+    def __init__(self, max_entries=512, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'maxEntries': self.max_entries,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'notModified': self.not_modified,
+                'evictions': self.evictions
+            }
+
+    def _not_modified(self, etag):
+        with self.lock:
+            self.not_modified += 1
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    def cached(self, get_version):
+        """Decorate a GET view with ETag/If-None-Match handling and response caching
+
+        The ETag is derived from the dataset version and the request key, so a
+        matching If-None-Match is answered with 304 before the view runs.
+        "If-None-Match: *" gets 304 only when the view answers 200.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                version = get_version()
+                key = request_key()
+                etag = hashlib.sha1(f'{version}|{key!r}'.encode()).hexdigest()[:24]
+
+                conditions = request.if_none_match
+                # If-None-Match uses weak comparison, so W/"<etag>" from a proxy also matches
+                if not conditions.star_tag and conditions.contains_weak(etag):
+                    return self._not_modified(etag)
+
+                entry = self.get((version, key))
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    headers = [(name, response.headers[name]) for name in CACHED_HEADERS if name in response.headers]
+                    entry = (response.get_data(), headers)
+                    self.put((version, key), entry)
+
+                if conditions.star_tag:
+                    # "*" matches any current representation, so only once a 200 exists for this key
+                    return self._not_modified(etag)
+
+                body, headers = entry
+                response = Response(body, headers=headers)
+                response.set_etag(etag)
+                return response
+            return wrapper
+        return decorator
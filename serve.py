@@ -0,0 +1,54 @@
+"""Production server for api.py or app.py
+
+Cheap lookups are answered by waitress threads; team stats, criteria search
+and upload parsing run in a bounded process pool so a slow pandas request
+does not hold the GIL for everyone else. Connections beyond the limit wait
+in the listen backlog, offloaded requests beyond the queue get 503, and
+offloaded requests slower than the timeout get 504.
+
+    python serve.py api --port 5000 --workers 3
+    python serve.py app --port 8080 --threads 16
+"""
+import argparse
+import importlib
+import os
+
+from waitress import serve
+
+from worker_pool import default_workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('module', choices=['api', 'app'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=8, help='request threads')
+    parser.add_argument('--workers', type=int, default=default_workers(), help='worker processes, 0 to disable')
+    parser.add_argument('--queue', type=int, default=0, help='offloaded requests in flight before 503')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds before an offloaded request gets 504')
+    parser.add_argument('--connection-limit', type=int, default=256)
+    parser.add_argument('--backlog', type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    # The modules read their pool settings when imported
+    os.environ['WORKER_PROCESSES'] = str(args.workers)
+    os.environ['WORKER_QUEUE'] = str(args.queue)
+    if args.timeout is not None:
+        os.environ['REQUEST_TIMEOUT'] = str(args.timeout)
+
+    module = importlib.import_module(args.module)
+    # Fork the workers up front so the first offloaded request does not wait for them
+    module.pool.start()
+    if args.module == 'api' and module.app.config['DATA_WATCH_INTERVAL'] > 0:
+        module.store.watch(module.app.config['DATA_WATCH_INTERVAL'])
+
+    port = args.port or (5000 if args.module == 'api' else 8080)
+    print(f"Serving {args.module}.py on http://{args.host}:{port} "
+          f"with {args.threads} threads and {args.workers} worker processes")
+    serve(module.app, host=args.host, port=port, threads=args.threads,
+          connection_limit=args.connection_limit, backlog=args.backlog)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from werkzeug.utils import secure_filename
+
+CHUNK_ROWS = 50_000
+HISTOGRAM_BINS = 50
+SAMPLE_ROWS = 5_000
+PREVIEW_ROWS = 100
+MAX_CATEGORIES = 1_000
+TOP_CATEGORIES = 20
+
+
+def spool_upload(file, folder, buffer_size=1 << 20):
+    """Copy an uploaded file to disk in fixed-size blocks
+
+    Returns the path and the SHA-256 of the content, computed during the copy.
+    """
+    name = f'{uuid.uuid4().hex}_{secure_filename(file.filename)}'
+    path = os.path.join(folder, name)
+    digest = hashlib.sha256()
+    with open(path, 'wb') as out:
+        for block in iter(lambda: file.stream.read(buffer_size), b''):
+            digest.update(block)
+            out.write(block)
+    return path, digest.hexdigest()
+
+
+def iter_csv_chunks(path, chunk_rows=CHUNK_ROWS):
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_excel_chunks(path, engine, chunk_rows=CHUNK_ROWS):
+    """Yield row chunks from a workbook's first sheet
+
+    .xlsx/.xlsm workbooks are read row by row in openpyxl's read-only mode;
+    other formats have no streaming reader and are loaded whole.
+    """
+    if engine != 'openpyxl':
+        df = pd.read_excel(path, engine=engine)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(value) for value in next(rows, ())]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=header).infer_objects()
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header).infer_objects()
+    finally:
+        workbook.close()
+
+
+class StreamingHistogram:
+    """Fixed bin count histogram whose range doubles as new extremes arrive"""
+
+    def __init__(self, bins=HISTOGRAM_BINS):
+        self.bins = bins + bins % 2  # Merging bins in pairs needs an even count
+        self.counts = None
+        self.low = None
+        self.width = None
+
+    def _grow(self, downward):
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        padding = np.zeros(self.bins // 2, dtype='int64')
+        if downward:
+            self.counts = np.concatenate((padding, merged))
+            self.low -= self.width * self.bins
+        else:
+            self.counts = np.concatenate((merged, padding))
+        self.width *= 2
+
+    def update(self, values):
+        if not len(values):
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.counts is None:
+            self.low = low
+            self.width = (high - low) / self.bins or 1.0
+            self.counts = np.zeros(self.bins, dtype='int64')
+        while low < self.low:
+            self._grow(downward=True)
+        while high > self.low + self.width * self.bins:
+            self._grow(downward=False)
+        positions = np.minimum(((values - self.low) / self.width).astype('int64'), self.bins - 1)
+        self.counts += np.bincount(positions, minlength=self.bins)
+
+    def edges(self):
+        return self.low + self.width * np.arange(self.bins + 1)
+
+
+class ColumnProfile:
+    """Single-pass histogram and value counts for one column, the data behind the index charts"""
+
+    def __init__(self, name):
+        self.name = name
+        self.numeric = True
+        self.count = 0
+        self.histogram = StreamingHistogram()
+        self.value_counts = {}
+        self.other = 0
+
+    def update(self, series):
+        values = series.dropna()
+        self.count += len(values)
+
+        if self.numeric and not (pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)):
+            self.numeric = False
+        if self.numeric and len(values):
+            array = values.to_numpy(dtype='float64')
+            finite = array[np.isfinite(array)]
+            if len(finite):
+                self.histogram.update(finite)
+
+        # Categorical values are counted up to a cap, so a unique-per-row column stays bounded
+        if not self.numeric:
+            counts = values.value_counts(sort=False)
+            known = counts.index.isin(list(self.value_counts))
+            for value, count in counts[known].items():
+                self.value_counts[value] += int(count)
+            new = counts[~known]
+            room = MAX_CATEGORIES - len(self.value_counts)
+            for value, count in new.iloc[:room].items():
+                self.value_counts[value] = int(count)
+            self.other += int(new.iloc[room:].sum())
+
+    def top_values(self, n=TOP_CATEGORIES):
+        return sorted(self.value_counts.items(), key=lambda item: -item[1])[:n]
+
+
+class DatasetProfile:
+    """Aggregates built from a stream of chunks: per-column chart data, a uniform sample and a preview"""
+
+    def __init__(self, sample_rows=SAMPLE_ROWS, preview_rows=PREVIEW_ROWS, seed=0):
+        self.rows = 0
+        self.columns = {}
+        self.sample_rows = sample_rows
+        self.preview_rows = preview_rows
+        self.preview = None
+        self.sample = None
+        self.sample_keys = np.empty(0)
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, chunk):
+        chunk = chunk.reset_index(drop=True)
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnProfile(column)
+            self.columns[column].update(chunk[column])
+
+        if self.preview is None:
+            self.preview = chunk.head(self.preview_rows).copy()
+        elif len(self.preview) < self.preview_rows:
+            self.preview = pd.concat([self.preview, chunk.head(self.preview_rows - len(self.preview))],
+                                     ignore_index=True)
+
+        # Keep the rows with the smallest random keys: a uniform sample without replacement
+        keys = self.rng.random(len(chunk))
+        if self.sample is None:
+            candidates, candidate_keys = chunk, keys
+        else:
+            candidates = pd.concat([self.sample, chunk], ignore_index=True)
+            candidate_keys = np.concatenate((self.sample_keys, keys))
+        keep = np.argsort(candidate_keys, kind='stable')[:self.sample_rows]
+        self.sample = candidates.iloc[keep].reset_index(drop=True)
+        self.sample_keys = candidate_keys[keep]
+        self.rows += len(chunk)
+
+    @property
+    def numeric_columns(self):
+        return [name for name, column in self.columns.items() if column.numeric and column.count]
+
+
+def profile_chunks(chunks):
+    profile = DatasetProfile()
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+
+def build_figures(profile):
+    """Build the index page charts from a profile instead of the full frame"""
+    numeric_cols = profile.numeric_columns
+    if numeric_cols:
+        column = profile.columns[numeric_cols[0]]
+        edges = column.histogram.edges()
+        fig1 = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=column.histogram.counts,
+                      labels={'x': column.name, 'y': 'count'},
+                      title=f'Distribution of {column.name} ({profile.rows:,} rows)')
+        fig1.update_traces(width=column.histogram.width)
+
+        fig2 = None
+        if len(numeric_cols) >= 2:
+            fig2 = px.scatter(profile.sample, x=numeric_cols[0], y=numeric_cols[1], render_mode='webgl',
+                              title=f'{numeric_cols[0]} vs {numeric_cols[1]} '
+                                    f'(random sample of {len(profile.sample):,} of {profile.rows:,} rows)')
+    else:
+        column = profile.columns[next(iter(profile.columns))]
+        values, counts = zip(*column.top_values()) if column.value_counts else ((), ())
+        fig1 = px.bar(x=list(values), y=list(counts), labels={'x': column.name, 'y': 'count'},
+                      title=f'Distribution of {column.name} ({profile.rows:,} rows)')
+        fig2 = px.pie(names=list(values), values=list(counts), title=f'Distribution of {column.name}')
+    return fig1, fig2
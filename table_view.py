@@ -0,0 +1,100 @@
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Sort orders kept per table; each is one int64 array per row and is not counted by AnalysisCache
+MAX_ORDERS = 8
+COMPARISON = re.compile(r'^\s*(<=|>=|<|>|=)?\s*(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)\s*$')
+
+
+def json_records(df):
+    """Rows as dicts of JSON-safe values: NaN/NaT become None, timestamps ISO strings"""
+    records = []
+    columns = list(df.columns)
+    for values in zip(*(df[column].tolist() for column in columns)):
+        row = {}
+        for column, value in zip(columns, values):
+            if isinstance(value, float) and value != value:
+                value = None
+            elif value is pd.NaT:
+                value = None
+            elif isinstance(value, pd.Timestamp):
+                value = value.isoformat()
+            row[str(column)] = value
+        records.append(row)
+    return records
+
+
+class TableView:
+    """Server-side sorting, filtering and paging over one loaded frame"""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.columns = [str(column) for column in self.df.columns]
+        self.orders = OrderedDict()
+        self.orders_lock = threading.Lock()
+        self.text = {}
+
+    def _column(self, name):
+        for column in self.df.columns:
+            if str(column) == name:
+                return self.df[column]
+        raise KeyError(name)
+
+    def _lowercase(self, name):
+        # String forms are built once per column and reused by every filter request
+        if name not in self.text:
+            self.text[name] = self._column(name).astype(str).str.lower()
+        return self.text[name]
+
+    def _mask(self, name, text):
+        series = self._column(name)
+        match = COMPARISON.match(text)
+        if match and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            op, number = match.group(1) or '=', float(match.group(2))
+            values = series.to_numpy(dtype='float64')
+            return {'<': values < number, '<=': values <= number, '>': values > number,
+                    '>=': values >= number, '=': values == number}[op]
+        return self._lowercase(name).str.contains(text.lower(), regex=False).to_numpy()
+
+    def order(self, sort):
+        """Row positions sorted by one column, '-' prefix for descending; missing values last"""
+        descending = sort.startswith('-')
+        # Only one '-' is a direction; '--PTS' names a column called '-PTS'
+        key = (sort[1:] if descending else sort, descending)
+        with self.orders_lock:
+            order = self.orders.get(key)
+            if order is not None:
+                self.orders.move_to_end(key)
+                return order
+        series = self._column(key[0])
+        try:
+            order = series.sort_values(ascending=not descending, kind='stable',
+                                       na_position='last').index.to_numpy()
+        except TypeError:
+            # Spreadsheet columns can mix numbers and text; those sort by their string form
+            order = series.sort_values(ascending=not descending, kind='stable', na_position='last',
+                                       key=lambda values: values.map(str).where(values.notna())).index.to_numpy()
+        with self.orders_lock:
+            self.orders[key] = order
+            if len(self.orders) > MAX_ORDERS:
+                self.orders.popitem(last=False)
+        return order
+
+    def page(self, page=1, page_size=DEFAULT_PAGE_SIZE, sort=None, filters=None):
+        """Return (matching row count, records for the 1-based page)"""
+        rows = self.order(sort) if sort else np.arange(len(self.df))
+        if filters:
+            mask = np.ones(len(self.df), dtype=bool)
+            for name, text in filters.items():
+                if text:
+                    mask &= self._mask(name, text)
+            rows = rows[mask[rows]]
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+        start = (max(page, 1) - 1) * page_size
+        return len(rows), json_records(self.df.iloc[rows[start:start + page_size]])
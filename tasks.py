@@ -0,0 +1,44 @@
+"""Request work that can run in a WorkerPool process
+
+Arguments and results are plain picklable values. Forked workers run on
+the snapshot they inherited; the pool is recycled whenever a new snapshot
+goes live, so loading never happens on the request path. Spawned workers
+load the files once on their first task.
+"""
+from data_store import shared_store
+from worker_pool import Overloaded
+
+
+def dataset_at(version):
+    """The worker's snapshot, which must be the `version` the request was validated against
+
+    A task that reaches a worker from before a swap is refused with
+    Overloaded (503 with Retry-After) rather than answering from other data;
+    by the time the client retries the pool has been recycled.
+    """
+    dataset = shared_store().current
+    if dataset.version != version:
+        raise Overloaded('Data is being reloaded, please retry')
+    return dataset
+
+
+def search_players(version, arguments):
+    """Return (total, page) for PlayerFilter.search keyword arguments"""
+    return dataset_at(version).player_filter.search(**arguments)
+
+
+def team_summary(version, team_id):
+    team_index = dataset_at(version).team_index
+    return team_index.recent_games(team_id), team_index.stats(team_id)
+
+
+def team_summaries(version, team_ids):
+    """Return {team_id: (recent games, season stats)} for teams known to the index"""
+    team_index = dataset_at(version).team_index
+    recent = team_index.recent_games_many(team_ids)
+    return {team_id: (recent[team_id], team_index.stats(team_id)) for team_id in team_ids}
+
+
+def search_trades(version, team_id, options):
+    """Return TradeEngine.search results for keyword `options`"""
+    return dataset_at(version).trade_engine.search(team_id, **options)
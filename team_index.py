@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+RECENT_GAMES = 10
+RECENT_COLUMNS = ['date_game', 'game_result', 'pts', 'opp_pts', 'elo_n']
+
+
+class TeamIndex:
+    """Per-team game positions sorted by date and season aggregates, built once per load"""
+
+    def __init__(self, teams_df, franchise_df=None):
+        games = teams_df.reset_index(drop=True)
+        self.games = games
+        # Plain arrays for the recent games rows; second-resolution dates list as datetimes
+        self.recent_columns = {column: games[column].to_numpy() for column in RECENT_COLUMNS}
+        self.recent_columns['date_game'] = games['date_game'].to_numpy(dtype='datetime64[ns]').astype('datetime64[s]')
+
+        # Group rows by team, newest game first within each team
+        codes, team_ids = pd.factorize(games['team_id'])
+        dates = games['date_game'].values.astype('datetime64[ns]').astype('int64')
+        self.order = np.lexsort((-dates, codes))
+        counts = np.bincount(codes, minlength=len(team_ids))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        # Wins, losses, scoring and latest Elo for every team in one groupby pass
+        result = games['game_result']
+        aggregates = pd.DataFrame({
+            'team': codes,
+            'win': (result == 'W').values,
+            'loss': (result == 'L').values,
+            'pts': games['pts'].values,
+            'opp_pts': games['opp_pts'].values,
+        }).groupby('team', sort=True).agg(
+            wins=('win', 'sum'),
+            losses=('loss', 'sum'),
+            avgPoints=('pts', 'mean'),
+            avgPointsAllowed=('opp_pts', 'mean'),
+        )
+        latest_elo = games['elo_n'].values[self.order[starts]]
+
+        self.slices = {}
+        self.season_stats = {}
+        for code, team_id in enumerate(team_ids):
+            row = aggregates.iloc[code]
+            self.slices[team_id] = (int(starts[code]), int(starts[code] + counts[code]))
+            self.season_stats[team_id] = {
+                'wins': int(row['wins']),
+                'losses': int(row['losses']),
+                'avgPoints': float(row['avgPoints']),
+                'avgPointsAllowed': float(row['avgPointsAllowed']),
+                'currentElo': float(latest_elo[code])
+            }
+
+        # First franchise row per team, matching the old `.iloc[0]` lookup
+        self.info = {}
+        if franchise_df is not None:
+            first_rows = franchise_df.drop_duplicates('Team').set_index('Team')
+            for team_id, row in first_rows.iterrows():
+                self.info[team_id] = {
+                    'fullName': row['Full_Name'],
+                    'league': row['League'],
+                    'conference': row['Conference'],
+                    'division': row['Division']
+                }
+
+    def __contains__(self, team_id):
+        return team_id in self.slices
+
+    def recent_games(self, team_id, n=RECENT_GAMES):
+        """Return the team's last `n` games, newest first"""
+        start, stop = self.slices[team_id]
+        positions = self.order[start:min(stop, start + n)]
+        values = [self.recent_columns[column][positions].tolist() for column in RECENT_COLUMNS]
+        return [dict(zip(RECENT_COLUMNS, row)) for row in zip(*values)]
+
+    def recent_games_many(self, team_ids, n=RECENT_GAMES):
+        """Return {team_id: last `n` games} for several teams with one gather per column"""
+        ranges = [self.slices[team_id] for team_id in team_ids]
+        positions = np.concatenate([self.order[start:min(stop, start + n)] for start, stop in ranges]
+                                   or [np.empty(0, dtype='int64')])
+        values = [self.recent_columns[column][positions].tolist() for column in RECENT_COLUMNS]
+        rows = [dict(zip(RECENT_COLUMNS, row)) for row in zip(*values)]
+        games = {}
+        offset = 0
+        for team_id, (start, stop) in zip(team_ids, ranges):
+            count = min(stop - start, n)
+            games[team_id] = rows[offset:offset + count]
+            offset += count
+        return games
+
+    def stats(self, team_id):
+        """Return the precomputed season aggregates for a team"""
+        return self.season_stats[team_id]
@@ -0,0 +1,52 @@
+from itertools import combinations
+
+import pytest
+
+from benchmarks.synthetic import make_players
+from trade_engine import COMPONENTS, MAX_PACKAGE_SIZE, TradeEngine
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return TradeEngine(make_players(700))
+
+
+def brute_force(engine, team_id, give, get, objective, limit, max_candidates,
+                max_partner_loss=None, max_minutes_change=None):
+    """Top gains from scoring every package pair against every partner"""
+    value = engine.values[objective]
+    minutes = engine.stats[:, COMPONENTS.index('MP')]
+    own = list(combinations(engine.rosters[team_id][:max_candidates], give))
+    gains = []
+    for other in engine.team_ids:
+        if other == team_id:
+            continue
+        for theirs in combinations(engine.rosters[other][:max_candidates], get):
+            for mine in own:
+                gain = value[list(theirs)].sum() - value[list(mine)].sum()
+                if max_partner_loss is not None and gain > max_partner_loss:
+                    continue
+                if (max_minutes_change is not None
+                        and abs(minutes[list(theirs)].sum() - minutes[list(mine)].sum()) > max_minutes_change):
+                    continue
+                gains.append(gain)
+    return sorted(gains, reverse=True)[:limit]
+
+
+@pytest.mark.parametrize('give, get, objective, options', [
+    (1, 1, 'points', {}),
+    (3, 2, 'efficiency', {}),
+    (2, 2, 'rebounds', {'max_partner_loss': 2.0}),
+    (2, 3, 'assists', {'max_minutes_change': 10.0}),
+])
+def test_search_matches_brute_force(engine, give, get, objective, options):
+    result = engine.search('ATL', give=give, get=get, objective=objective, limit=10, max_candidates=6, **options)
+    expected = brute_force(engine, 'ATL', give, get, objective, 10, 6, **options)
+    assert [trade['gain'] for trade in result['trades']] == pytest.approx(expected, abs=1e-3)
+
+
+def test_search_rejects_oversized_packages(engine):
+    with pytest.raises(ValueError):
+        engine.search('ATL', give=MAX_PACKAGE_SIZE + 1, get=1)
+    with pytest.raises(ValueError):
+        engine.search('ATL', give=5, get=5, max_candidates=15)
@@ -0,0 +1,217 @@
+import heapq
+import math
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# Additive per-player components; every team metric is derived from their roster sums
+COMPONENTS = ['PTS', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'MP', 'FG', 'FGA', 'FT', 'FTA', 'MP_AGE']
+# Season totals rows for players who changed teams; rosters use the per-team rows
+TOTAL_TEAM = 'TOT'
+# Objectives the search can rank by: each is a per-player value summed over a package
+SEARCH_OBJECTIVES = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'efficiency']
+MAX_CANDIDATES = 10
+# Largest package either side may trade
+MAX_PACKAGE_SIZE = 5
+# Most (own package, partner package) pairs one partner may contribute; bounds the gain matrix
+MAX_PAIRS = 1_000_000
+
+
+def team_metrics(totals):
+    """Team metrics from component sums; `totals` is (..., len(COMPONENTS))"""
+    totals = np.asarray(totals, dtype='float64')
+    c = {name: totals[..., i] for i, name in enumerate(COMPONENTS)}
+    efficiency = (c['PTS'] + c['TRB'] + c['AST'] + c['STL'] + c['BLK']
+                  - (c['FGA'] - c['FG']) - (c['FTA'] - c['FT']) - c['TOV'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'points': c['PTS'],
+            'rebounds': c['TRB'],
+            'assists': c['AST'],
+            'steals': c['STL'],
+            'blocks': c['BLK'],
+            'turnovers': c['TOV'],
+            'minutes': c['MP'],
+            'efficiency': efficiency,
+            # Minutes-weighted means: sum(MP * x / MP) / sum(MP) reduces to ratios of sums
+            'efficiencyPer36': 36 * efficiency / c['MP'],
+            'averageAge': c['MP_AGE'] / c['MP'],
+            'fieldGoalPercentage': 100 * c['FG'] / c['FGA'],
+            'trueShooting': 100 * c['PTS'] / (2 * (c['FGA'] + 0.44 * c['FTA']))
+        }
+
+
+def _metrics_dict(totals):
+    return {name: (None if np.isnan(value) else round(float(value), 3))
+            for name, value in team_metrics(totals).items()}
+
+
+class TradeEngine:
+    """Per-team roster aggregates with trades applied as vector deltas
+
+    Every player row is a vector of additive components. A team is the sum of
+    its rows, so a trade changes each side by the difference of two package
+    sums and no roster is aggregated again.
+    """
+
+    def __init__(self, players_df):
+        players = players_df[players_df['Tm'].astype(str) != TOTAL_TEAM].reset_index(drop=True)
+        self.names = players['Player'].astype(str).to_numpy()
+        self.teams = players['Tm'].astype(str).to_numpy()
+
+        minutes = players['MP'].to_numpy(dtype='float64')
+        columns = {name: players[name].to_numpy(dtype='float64') for name in COMPONENTS if name != 'MP_AGE'}
+        columns['MP_AGE'] = minutes * players['Age'].to_numpy(dtype='float64')
+        # Missing stats contribute nothing rather than poisoning the team sums
+        self.stats = np.nan_to_num(np.column_stack([columns[name] for name in COMPONENTS]))
+
+        codes, team_ids = pd.factorize(self.teams)
+        self.team_ids = list(team_ids)
+        self.team_codes = {team_id: code for code, team_id in enumerate(self.team_ids)}
+        self.totals = np.zeros((len(self.team_ids), len(COMPONENTS)))
+        np.add.at(self.totals, codes, self.stats)
+
+        # Roster row positions per team, most minutes first
+        order = np.lexsort((-np.nan_to_num(minutes), codes))
+        bounds = np.cumsum(np.bincount(codes, minlength=len(self.team_ids)))[:-1]
+        self.rosters = dict(zip(self.team_ids, np.split(order, bounds)))
+        self.player_rows = {(team, name): row for row, (team, name) in enumerate(zip(self.teams, self.names))}
+
+        self.values = {name: team_metrics(self.stats)[name] for name in SEARCH_OBJECTIVES}
+
+    def __contains__(self, team_id):
+        return team_id in self.team_codes
+
+    def profile(self, team_id):
+        return _metrics_dict(self.totals[self.team_codes[team_id]])
+
+    def rows_for(self, team_id, names):
+        """Row positions of `names` on `team_id`'s roster; KeyError names the first unknown player"""
+        rows = []
+        for name in names:
+            row = self.player_rows.get((team_id, name))
+            if row is None:
+                raise KeyError(f'{name} is not on the {team_id} roster')
+            rows.append(row)
+        if len(set(rows)) < len(rows):
+            raise ValueError('A player is listed twice in one package')
+        return np.array(rows, dtype='int64')
+
+    def impact(self, team_a, rows_a, team_b, rows_b):
+        """Before, after and change in every metric when A sends rows_a to B for rows_b"""
+        delta = self.stats[rows_b].sum(axis=0) - self.stats[rows_a].sum(axis=0)
+        result = {}
+        for team_id, sign, sent, received in ((team_a, 1, rows_a, rows_b), (team_b, -1, rows_b, rows_a)):
+            before = self.totals[self.team_codes[team_id]]
+            after = before + sign * delta
+            metrics_before, metrics_after = _metrics_dict(before), _metrics_dict(after)
+            result[team_id] = {
+                'sends': self.names[sent].tolist(),
+                'receives': self.names[received].tolist(),
+                'before': metrics_before,
+                'after': metrics_after,
+                'change': {name: (None if metrics_after[name] is None or metrics_before[name] is None
+                                  else round(metrics_after[name] - metrics_before[name], 3))
+                           for name in metrics_before}
+            }
+        return result
+
+    def evaluate(self, team_a, send_a, team_b, send_b):
+        """Impact of a trade given by player names; raises KeyError or ValueError when invalid"""
+        for team_id in (team_a, team_b):
+            if team_id not in self:
+                raise KeyError(f'Team {team_id} not found')
+        if team_a == team_b:
+            raise ValueError('A trade needs two different teams')
+        return self.impact(team_a, self.rows_for(team_a, send_a), team_b, self.rows_for(team_b, send_b))
+
+    def _packages(self, team_id, size, value, max_candidates):
+        """All `size`-player packages from the team's top-minutes players: (rows, value, minutes)"""
+        candidates = self.rosters[team_id][:max_candidates]
+        if size > len(candidates):
+            return None
+        rows = np.array(list(combinations(candidates, size)), dtype='int64').reshape(-1, size)
+        minutes = self.stats[:, COMPONENTS.index('MP')]
+        return rows, value[rows].sum(axis=1), minutes[rows].sum(axis=1)
+
+    def search(self, team_id, give=3, get=2, objective='efficiency', partner=None, limit=10,
+               max_candidates=MAX_CANDIDATES, max_partner_loss=None, max_minutes_change=None):
+        """Best trades for `team_id` sending `give` players for `get`, ranked by objective gain
+
+        Packages are drawn from each roster's `max_candidates` heaviest-minutes
+        players. Because the objective is additive, a trade's gain is the
+        received package's value minus the sent package's, so every partner's
+        pairs are scored in one broadcast. Partners are visited in order of
+        their best possible gain and skipped once that bound cannot beat the
+        current top `limit`.
+        """
+        if team_id not in self:
+            raise KeyError(f'Team {team_id} not found')
+        if objective not in SEARCH_OBJECTIVES:
+            raise ValueError(f'Unknown objective: {objective}')
+        if give < 1 or get < 1:
+            raise ValueError('Both packages need at least one player')
+        if give > MAX_PACKAGE_SIZE or get > MAX_PACKAGE_SIZE:
+            raise ValueError(f'Packages are limited to {MAX_PACKAGE_SIZE} players')
+        # Checked before any package is enumerated
+        if math.comb(max_candidates, give) * math.comb(max_candidates, get) > MAX_PAIRS:
+            raise ValueError('Too many package pairs to search; lower give, get or candidates')
+        if partner is not None and (partner not in self or partner == team_id):
+            raise KeyError(f'Team {partner} not found')
+
+        value = self.values[objective]
+        own = self._packages(team_id, give, value, max_candidates)
+        if own is None:
+            return {'evaluated': 0, 'partnersSearched': 0, 'trades': []}
+        own_rows, own_value, own_minutes = own
+
+        partners = [partner] if partner is not None else [t for t in self.team_ids if t != team_id]
+        offers = []
+        for other in partners:
+            packages = self._packages(other, get, value, max_candidates)
+            if packages is not None:
+                bound = float(packages[1].max() - own_value.min())
+                if max_partner_loss is not None:
+                    bound = min(bound, max_partner_loss)
+                offers.append((bound, other, packages))
+        offers.sort(key=lambda offer: -offer[0])
+
+        best = []  # Min-heap of (gain, sequence, team, own package, their package)
+        evaluated = 0
+        searched = 0
+        sequence = 0
+        for bound, other, (their_rows, their_value, their_minutes) in offers:
+            if len(best) >= limit and bound <= best[0][0]:
+                break
+            searched += 1
+            gain = their_value[None, :] - own_value[:, None]
+            valid = np.ones(gain.shape, dtype=bool)
+            if max_partner_loss is not None:
+                valid &= gain <= max_partner_loss
+            if max_minutes_change is not None:
+                valid &= np.abs(their_minutes[None, :] - own_minutes[:, None]) <= max_minutes_change
+            evaluated += gain.size
+            gain = np.where(valid, gain, -np.inf)
+
+            flat = gain.ravel()
+            top = min(limit, int(valid.sum()))
+            if top == 0:
+                continue
+            for position in np.argpartition(-flat, top - 1)[:top]:
+                i, j = divmod(int(position), gain.shape[1])
+                entry = (float(flat[position]), sequence, other, own_rows[i], their_rows[j])
+                sequence += 1
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry[0] > best[0][0]:
+                    heapq.heapreplace(best, entry)
+
+        trades = []
+        for gain, _, other, own_package, their_package in sorted(best, key=lambda entry: (-entry[0], entry[1])):
+            trades.append({
+                'partner': other,
+                'gain': round(gain, 3),
+                'impact': self.impact(team_id, own_package, other, their_package)
+            })
+        return {'evaluated': evaluated, 'partnersSearched': searched, 'trades': trades}
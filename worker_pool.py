@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+
+class Overloaded(Exception):
+    """Raised when every pool slot is taken; the caller should answer 503"""
+
+
+class RequestTimeout(Exception):
+    """Raised when offloaded work does not finish in time; the caller should answer 504"""
+
+
+class WorkerPool:
+    """Bounded process pool for CPU-heavy request work
+
+    At most `max_pending` tasks may be queued or running; further requests
+    are refused immediately instead of piling up behind slow ones. With
+    `workers=0` tasks run inline in the calling thread, which keeps the
+    development server and tests single-process.
+
+    Workers are forked so they inherit the loaded snapshot. Where fork is
+    unavailable (Windows) they are spawned instead and each loads the data
+    files once when it starts.
+    """
+
+    def __init__(self, workers=0, max_pending=None, timeout=30.0):
+        self.workers = workers
+        self.max_pending = max_pending or max(workers * 4, 1)
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+        self.recycled = 0
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    def _executor(self):
+        with self.lock:
+            if self.executor is None:
+                # Forked workers inherit the loaded data and its memory-mapped columns
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.context)
+            return self.executor
+
+    def _replace_broken(self, executor):
+        # Only the first request to see the broken executor replaces it
+        with self.lock:
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+                self.restarts += 1
+
+    def start(self):
+        """Fork the workers now rather than on the first offloaded request"""
+        if self.workers:
+            self._executor().submit(os.getpid).result()
+
+    def recycle(self):
+        """Replace the workers so new tasks run in processes forked from the current snapshot
+
+        Tasks already submitted finish in the old workers, which exit afterwards.
+        This forks while server threads are running: a forked worker only runs
+        task code, and data_store replaces the locks that code takes in every
+        forked child, so a lock held elsewhere at fork time cannot deadlock it.
+        """
+        with self.lock:
+            old, self.executor = self.executor, None
+            if old is None:
+                return
+            self.recycled += 1
+        old.shutdown(wait=False)
+        self.start()
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` in a worker process and return its result"""
+        if not self.workers:
+            return fn(*args)
+
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise Overloaded(f'All {self.max_pending} worker slots are busy')
+
+        executor = self._executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self.slots.release()
+            self._replace_broken(executor)
+            raise Overloaded('A worker process died; the pool is restarting')
+        except Exception:
+            self.slots.release()
+            raise
+        # The slot is held until the task really finishes, even after a timeout
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self.lock:
+                self.timed_out += 1
+            raise RequestTimeout(f'Request took longer than {self.timeout:g}s')
+        except BrokenProcessPool:
+            # A worker was killed (e.g. out of memory); new workers are forked on the next request
+            self._replace_broken(executor)
+            raise Overloaded('A worker process died; the pool is restarting')
+        with self.lock:
+            self.completed += 1
+        return result
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'maxPending': self.max_pending,
+                'timeoutSeconds': self.timeout,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timedOut': self.timed_out,
+                'restarts': self.restarts,
+                'recycled': self.recycled
+            }
+
+
+def default_workers():
+    return max((os.cpu_count() or 2) - 1, 1)